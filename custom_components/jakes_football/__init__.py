@@ -2,46 +2,220 @@
 
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_API_KEY, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
 
-from .competitions import Competition
-from .const import DOMAIN, LEAGUE_DATA, TEAM_DATA
+from . import clock
+from .catalogue import CatalogueAPI, async_sync_catalogue
+from .competitions import Competition, Competitions, get_season_number
+from .const import (
+    COMPETITIONS_CACHE,
+    CONF_IN_PLAY_REFRESH_FLOOR,
+    CONF_QUIET_WINDOW_END,
+    CONF_QUIET_WINDOW_START,
+    CUP_DATA,
+    DEFAULT_IN_PLAY_REFRESH_FLOOR,
+    DEFAULT_QUIET_WINDOW_END,
+    DEFAULT_QUIET_WINDOW_START,
+    DOMAIN,
+    KEY_POOL,
+    LEAGUE_DATA,
+    PROFILER,
+    SCHEDULER,
+    TEAM_DATA,
+)
+from .cup import CupAPI
+from .key_pool import ApiKeyPool
 from .league import LeagueAPI
+from .profiler import RefreshProfiler
+from .refresh_planner import RefreshPlanner
+from .scheduler import RequestScheduler
+from .services import async_setup_services, async_unload_services
+from .simulation import shutdown_executor
+from .sports_api import SportsAPI
+from .standings_history import StandingsHistory
 from .team import TeamAPI
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.CALENDAR, Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Jake's Football Tracker from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    if PROFILER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][PROFILER] = RefreshProfiler()
+        async_setup_services(hass)
+
+    async def async_shutdown(event: Event) -> None:
+        """Stop the season simulation worker process."""
+        await hass.async_add_executor_job(shutdown_executor)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown)
+    )
+    profiler: RefreshProfiler = hass.data[DOMAIN][PROFILER]
+    key_pool: ApiKeyPool = hass.data[DOMAIN].setdefault(KEY_POOL, ApiKeyPool())
+    scheduler: RequestScheduler = hass.data[DOMAIN].setdefault(
+        SCHEDULER, RequestScheduler()
+    )
+
     hass.data[DOMAIN][entry.entry_id] = {}
     api_key = entry.data[CONF_API_KEY]
+    key_pool.add_key(api_key)
+    planner = RefreshPlanner(
+        entry.entry_id,
+        entry.options.get(CONF_QUIET_WINDOW_START, DEFAULT_QUIET_WINDOW_START),
+        entry.options.get(CONF_QUIET_WINDOW_END, DEFAULT_QUIET_WINDOW_END),
+    )
 
-    team: TeamAPI = TeamAPI(api_key=api_key, team_id=int(entry.data["team_id"]))
+    def attach(api: SportsAPI):
+        """Give an API object the shared helpers and this entry's refresh planner."""
+        api.profiler = profiler
+        api.key_pool = key_pool
+        api.scheduler = scheduler
+        api.planner = planner
+
+    team: TeamAPI = TeamAPI(
+        api_key=api_key,
+        team_id=int(entry.data["team_id"]),
+        in_play_refresh_floor=entry.options.get(
+            CONF_IN_PLAY_REFRESH_FLOOR, DEFAULT_IN_PLAY_REFRESH_FLOOR
+        ),
+    )
+    attach(team)
+    # Kept from before a reload, so a reload at the season rollover doesn't need to
+    # fetch them again
+    team.competitions = (
+        hass.data[DOMAIN].get(COMPETITIONS_CACHE, {}).pop(entry.entry_id, None)
+    )
     hass.data[DOMAIN][entry.entry_id][TEAM_DATA] = team
 
-    league_comp: Competition = await hass.async_add_executor_job(
+    competition_list: Competitions | None = await hass.async_add_executor_job(
+        team.get_competitions
+    )
+    if competition_list is None:
+        # Without the competitions there is nothing to set up, so have Home Assistant
+        # try again later
+        key_pool.remove_key(api_key)
+        hass.data[DOMAIN].pop(entry.entry_id)
+        raise ConfigEntryNotReady(
+            "Rate limit reached before the competitions were fetched"
+        )
+    competitions: list[Competition] = competition_list.competitions
+    league_comp: Competition | None = await hass.async_add_executor_job(
         team.get_league_competition
     )
 
+    # Track every competition this season, leagues by their standings and cups by their
+    # rounds
+    leagues: dict[int, LeagueAPI] = {}
+    cups: dict[int, CupAPI] = {}
+    for comp in competitions:
+        if comp.type == "League":
+            league: LeagueAPI = LeagueAPI(api_key=api_key, league_id=comp.id)
+            attach(league)
+            league.history_path = StandingsHistory.get_path(
+                hass.config.path(STORAGE_DIR), entry.entry_id, comp.id
+            )
+            await hass.async_add_executor_job(league.load_history)
+            leagues[comp.id] = league
+        else:
+            cup: CupAPI = CupAPI(api_key=api_key, competition=comp)
+            attach(cup)
+            cups[comp.id] = cup
+
+    hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA] = leagues
+    hass.data[DOMAIN][entry.entry_id][CUP_DATA] = cups
     if league_comp is not None:
-        league: LeagueAPI = LeagueAPI(api_key=api_key, league_id=league_comp.id)
-        hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA] = league
-        team.league = league
-    else:
-        hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA] = None
+        team.league = leagues[league_comp.id]
+
+    @callback
+    def async_migrate_unique_id(
+        registry_entry: er.RegistryEntry,
+    ) -> dict[str, Any] | None:
+        """Move entities from the name based unique ids of earlier versions to IDs."""
+        old_id = registry_entry.unique_id
+        if old_id.startswith(("sensor.jft_team_", "calendar.jft_team_")):
+            return {"new_unique_id": team.get_unique_id()}
+        if (
+            old_id.startswith(("sensor.jft_league_", "calendar.jft_league_"))
+            and len(leagues) == 1  # Earlier versions only tracked the team's league
+        ):
+            league_id = next(iter(leagues))
+            return {
+                "new_unique_id": team.get_competition_unique_id("league", league_id)
+            }
+        for cup in cups.values():
+            if old_id == "sensor.jft_cup_" + cup.get_unique_name():
+                return {
+                    "new_unique_id": team.get_competition_unique_id("cup", cup.cup_id)
+                }
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, async_migrate_unique_id)
+
+    @callback
+    def async_schedule_rollover(day: date) -> None:
+        """Check for the new season's competitions at this entry's planned time."""
+        planned: datetime = planner.get_planned_time("season_rollover", day)
+        entry.async_on_unload(
+            async_track_point_in_time(
+                hass, async_roll_over_season, dt_util.as_utc(planned)
+            )
+        )
+
+    async def async_roll_over_season(now: datetime) -> None:
+        """Move on to the new season's competitions.
+
+        Sets the entry up again if they have changed.
+        """
+        competition_list: Competitions | None = await hass.async_add_executor_job(
+            team.get_competitions
+        )
+        if (
+            competition_list is None
+            or competition_list.season_number != get_season_number()
+        ):
+            # Couldn't fetch them, so try again tomorrow
+            async_schedule_rollover(clock.now().date() + timedelta(days=1))
+            return
+
+        if {c.id for c in competition_list.competitions} != set(leagues) | set(cups):
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+            return
+        async_schedule_rollover(date(competition_list.season_number + 1, 6, 1))
+
+    # The season rolls over on the 1st of June, when warm_next_season has fetched the
+    # new competitions ahead of it
+    async_schedule_rollover(date(get_season_number() + 1, 6, 1))
+
+    # Fill in the team search catalogue with everyone we play this season
+    catalogue_api = CatalogueAPI(api_key)
+    attach(catalogue_api)
+    entry.async_create_background_task(
+        hass,
+        async_sync_catalogue(hass, catalogue_api, competitions),
+        "jakes_football catalogue sync",
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unload_ok
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget what was kept for a removed entry."""
+    hass.data.get(DOMAIN, {}).get(COMPETITIONS_CACHE, {}).pop(entry.entry_id, None)
+    await hass.async_add_executor_job(
+        StandingsHistory.remove_all, hass.config.path(STORAGE_DIR), entry.entry_id
+    )
@@ -0,0 +1,43 @@
+"""Decide how often to poll an in-play fixture from its status and elapsed time."""
+
+from .const import (
+    CLOSING_MINUTE_FIRST_HALF,
+    CLOSING_MINUTE_SECOND_HALF,
+    DEFAULT_IN_PLAY_REFRESH_FLOOR,
+    REFRESH_FREQ_MINUTES_BREAK_BEFORE_EXTRA_TIME,
+    REFRESH_FREQ_MINUTES_DELAYED,
+    REFRESH_FREQ_MINUTES_HALF_TIME,
+    REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS,
+    REFRESH_FREQ_MINUTES_SUSPENDED,
+)
+from .fixture import Status
+
+
+def get_in_play_refresh_minutes(
+    status: Status, floor: float = DEFAULT_IN_PLAY_REFRESH_FLOOR
+) -> float:
+    """Get the number of minutes to wait between refreshes of an in-play fixture.
+
+    Backs off while nothing can change (breaks, delays, suspensions) and speeds up to
+    the floor when the score or status could change at any moment (the end of each half,
+    extra time and penalties).
+    """
+    refresh_frequency: float = REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS
+    elapsed: int = status.elapsed if status.elapsed is not None else 0
+
+    if status.short == "HT":
+        refresh_frequency = REFRESH_FREQ_MINUTES_HALF_TIME
+    elif status.short == "BT":  # Break before extra time
+        refresh_frequency = REFRESH_FREQ_MINUTES_BREAK_BEFORE_EXTRA_TIME
+    elif status.short in ["SUSP", "INT"]:
+        refresh_frequency = REFRESH_FREQ_MINUTES_SUSPENDED
+    elif status.short == "NS":  # Kick off time has passed but the match hasn't started
+        refresh_frequency = REFRESH_FREQ_MINUTES_DELAYED
+    elif status.short in ["ET", "P"]:
+        refresh_frequency = floor
+    elif status.short == "1H" and elapsed >= CLOSING_MINUTE_FIRST_HALF:
+        refresh_frequency = floor
+    elif status.short == "2H" and elapsed >= CLOSING_MINUTE_SECOND_HALF:
+        refresh_frequency = floor
+
+    return max(refresh_frequency, floor)
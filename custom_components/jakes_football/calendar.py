@@ -0,0 +1,134 @@
+"""Football fixture calendars."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from homeassistant.components.calendar import (
+    ENTITY_ID_FORMAT,
+    CalendarEntity,
+    CalendarEvent,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import clock
+from .const import ATTRIBUTION, DOMAIN, LEAGUE_DATA, TEAM_DATA
+from .fixture import FixtureData
+from .fixture_index import FixtureIndex
+from .league import LeagueAPI
+from .team import TeamAPI
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up calendar entities."""
+
+    calendars: list[CalendarEntity] = []
+
+    teamApi: TeamAPI = hass.data[DOMAIN][entry.entry_id][TEAM_DATA]
+    await hass.async_add_executor_job(teamApi.get_team_name)
+    calendars.append(
+        FixtureCalendar(
+            hass,
+            get_name=lambda: teamApi.team_name,
+            unique_name=f"jft_team_{teamApi.get_unique_team_name()}",
+            unique_id=teamApi.get_unique_id(),
+            get_index=lambda: teamApi.fixture_index,
+            refresh=teamApi.refresh_fixture_data,
+        )
+    )
+
+    leagueApis: dict[int, LeagueAPI] = hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA]
+    for leagueApi in leagueApis.values():
+        await hass.async_add_executor_job(leagueApi.get_name)
+        calendars.append(
+            FixtureCalendar(
+                hass,
+                get_name=lambda league=leagueApi: league.name or None,
+                unique_name=f"jft_league_{leagueApi.get_unique_name()}",
+                unique_id=teamApi.get_competition_unique_id(
+                    "league", leagueApi.league_id
+                ),
+                get_index=lambda league=leagueApi: league.fixture_index,
+                refresh=leagueApi.refresh_fixtures,
+            )
+        )
+
+    async_add_entities(calendars)
+
+
+def fixture_to_event(fixture: FixtureData, index: FixtureIndex) -> CalendarEvent:
+    """Convert a fixture to a calendar event."""
+    summary: str = fixture.to_string()
+    if fixture.goals is not None and fixture.goals.home is not None:
+        summary = (
+            f"{fixture.home_team.name} {fixture.goals.home} - "
+            f"{fixture.goals.away} {fixture.away_team.name}"
+        )
+
+    return CalendarEvent(
+        start=datetime.fromtimestamp(fixture.fixture.timestamp, tz=UTC),
+        end=datetime.fromtimestamp(index.get_end_timestamp(fixture), tz=UTC),
+        summary=summary,
+        location=", ".join(
+            part for part in (fixture.fixture.stadium, fixture.fixture.location) if part
+        )
+        or None,
+        description=f"{fixture.competition.name} - {fixture.competition.round}",
+        uid=str(fixture.fixture.id),
+    )
+
+
+class FixtureCalendar(CalendarEntity):
+    """Calendar of a team's or league's fixtures, served from the cached season."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_icon = "mdi:calendar-star"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_name: Callable[[], str | None],
+        unique_name: str,
+        unique_id: str,
+        get_index: Callable[[], FixtureIndex],
+        refresh: Callable[[], None],
+    ) -> None:
+        """Initialise calendar attributes."""
+        CalendarEntity.__init__(self)
+        self.hass = hass
+        self.get_name = get_name
+        self.get_index = get_index
+        self.refresh = refresh
+
+        self.entity_id = ENTITY_ID_FORMAT.format(unique_name)
+        self._attr_name = get_name()
+        self._attr_unique_id = unique_id
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the fixture being played now, or the next one."""
+        index = self.get_index()
+        fixture = index.get_next(clock.now())
+        if fixture is None:
+            return None
+        return fixture_to_event(fixture, index)
+
+    async def async_update(self) -> None:
+        """Refresh the season's fixtures if they are out of date."""
+        await self.hass.async_add_executor_job(self.refresh)
+        self._attr_name = self.get_name()  # In case setup couldn't fetch it
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the fixtures between start and end, from memory."""
+        index = self.get_index()
+        return [
+            fixture_to_event(fixture, index)
+            for fixture in index.get_range(start_date, end_date)
+        ]
@@ -0,0 +1,292 @@
+"""A local catalogue of teams, to find a team by name without using up requests."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import Counter
+import logging
+from typing import Any
+import unicodedata
+from urllib.parse import quote
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .competitions import Competition, get_season_number
+from .const import (
+    CATALOGUE,
+    CATALOGUE_MIN_SIMILARITY,
+    CATALOGUE_SAVE_DELAY_SECONDS,
+    CATALOGUE_SEARCH_LIMIT,
+    CATALOGUE_STORAGE_KEY,
+    CATALOGUE_STORAGE_VERSION,
+    CATALOGUE_STORE,
+    DOMAIN,
+)
+from .exceptions import RequestDeferred
+from .scheduler import RequestPriority
+from .sports_api import SportsAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalise(text: str) -> str:
+    """Lowercase text and strip accents and punctuation, so 'Atlético' is 'atletico'."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    out = "".join(
+        c if c.isalnum() else " "
+        for c in decomposed.lower()
+        if not unicodedata.combining(c)
+    )
+    return " ".join(out.split())
+
+
+def get_trigrams(text: str) -> set[str]:
+    """Get every run of three characters in normalised text.
+
+    Padded so the start of each word counts.
+    """
+    padded = "  " + text + " "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def get_index_words(team: CatalogueTeam) -> set[str]:
+    """Get the words a team is found by in the prefix index.
+
+    These are its whole name, each word of it and its code.
+    """
+    name = normalise(team.name)
+    words = set(name.split())
+    words.add(name)
+    if team.code:
+        words.add(normalise(team.code))
+    return words
+
+
+class CatalogueTeam:
+    """A team that can be searched for."""
+
+    def __init__(self, data) -> None:
+        """Initialise from a team from the teams endpoint, or saved by to_dict."""
+        self.id: int = int(data["id"])
+        self.name: str = data["name"]
+        self.code: str | None = data.get("code")
+        self.country: str | None = data.get("country")
+        self.national: bool = bool(data.get("national", False))
+        self.logo: str | None = data.get("logo")
+        self.league_ids: set[int] = set(data.get("leagues", []))
+
+    def get_label(self, leagues: dict[int, str]) -> str:
+        """Get the name to show in a list of search results."""
+        details = [self.country] if self.country else []
+        details.extend(sorted(leagues[i] for i in self.league_ids if i in leagues))
+        if len(details) == 0:
+            return self.name
+        return self.name + " (" + ", ".join(details) + ")"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert this to a dict to save to disk."""
+        out: dict[str, Any] = {}
+        out["id"] = self.id
+        out["name"] = self.name
+        out["code"] = self.code
+        out["country"] = self.country
+        out["national"] = self.national
+        out["logo"] = self.logo
+        out["leagues"] = sorted(self.league_ids)
+        return out
+
+
+class TeamCatalogue:
+    """Teams, the leagues they play in and the seasons each league was last synced for.
+
+    Team names are indexed two ways. A sorted list of name words finds prefixes ('manc'
+    for Manchester City and Manchester United) with a binary search. A trigram index
+    finds names containing most of the search, so typos and missing words still match.
+    """
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        """Initialise from the data saved by to_dict, or empty."""
+        self.teams: dict[int, CatalogueTeam] = {}
+        self.leagues: dict[int, str] = {}
+        self.synced_leagues: dict[int, int] = {}  # League id to the season last synced
+
+        self.prefixes: list[tuple[str, int]] = []  # (word, team id), sorted
+        self.trigrams: dict[str, set[int]] = {}
+
+        if data is not None:
+            self.leagues = {int(k): v for k, v in data["leagues"].items()}
+            self.synced_leagues = {int(k): v for k, v in data["synced"].items()}
+            for team_data in data["teams"]:
+                self._add(CatalogueTeam(team_data))
+
+    def _add(self, team: CatalogueTeam):
+        """Add a team to the catalogue and the indexes."""
+        self.teams[team.id] = team
+        for word in get_index_words(team):
+            insort(self.prefixes, (word, team.id))
+        for trigram in get_trigrams(normalise(team.name)):
+            self.trigrams.setdefault(trigram, set()).add(team.id)
+
+    def _remove(self, team_id: int):
+        """Remove a team from the catalogue and the indexes."""
+        team = self.teams.pop(team_id)
+        for word in get_index_words(team):
+            i = bisect_left(self.prefixes, (word, team_id))
+            if i < len(self.prefixes) and self.prefixes[i] == (word, team_id):
+                del self.prefixes[i]
+        for trigram in get_trigrams(normalise(team.name)):
+            self.trigrams[trigram].discard(team_id)
+
+    def add_teams(self, response: list[dict[str, Any]], league_id: int | None = None):
+        """Add the teams returned by the teams endpoint, optionally to a league."""
+        for item in response:
+            team = CatalogueTeam(item["team"])
+            existing = self.teams.get(team.id)
+            if existing is not None:
+                team.league_ids |= existing.league_ids
+                self._remove(team.id)  # The name may have changed, so index it again
+            if league_id is not None:
+                team.league_ids.add(league_id)
+            self._add(team)
+
+    def add_league(self, competition: Competition):
+        """Remember the name of a league, to show alongside its teams."""
+        self.leagues[competition.id] = competition.name
+
+    def is_synced(self, league_id: int, season_number: int) -> bool:
+        """Check if a league's teams have already been fetched for a season."""
+        return self.synced_leagues.get(league_id) == season_number
+
+    def mark_synced(self, league_id: int, season_number: int):
+        """Record that a league's teams have been fetched for a season."""
+        self.synced_leagues[league_id] = season_number
+
+    def search(
+        self, query: str, limit: int = CATALOGUE_SEARCH_LIMIT
+    ) -> list[CatalogueTeam]:
+        """Find the teams that best match a search, best first."""
+        query = normalise(query)
+        if query == "":
+            return []
+
+        # Names or words starting with the search are the best matches, whole names
+        # first
+        scores: dict[int, float] = {}
+        i = bisect_left(self.prefixes, (query,))
+        while i < len(self.prefixes) and self.prefixes[i][0].startswith(query):
+            word, team_id = self.prefixes[i]
+            score = 2.0 if word == normalise(self.teams[team_id].name) else 1.5
+            scores[team_id] = max(scores.get(team_id, 0.0), score)
+            i += 1
+
+        # Then names containing most of the search
+        if len(query) >= 3:
+            query_trigrams = get_trigrams(query)
+            counts: Counter[int] = Counter()
+            for trigram in query_trigrams:
+                counts.update(self.trigrams.get(trigram, ()))
+            for team_id, count in counts.items():
+                similarity = count / len(query_trigrams)
+                if similarity >= CATALOGUE_MIN_SIMILARITY:
+                    scores[team_id] = max(scores.get(team_id, 0.0), similarity)
+
+        ranked = sorted(scores, key=lambda x: (-scores[x], self.teams[x].name))
+        return [self.teams[team_id] for team_id in ranked[:limit]]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert this to a dict to save to disk."""
+        out: dict[str, Any] = {}
+        out["teams"] = [team.to_dict() for team in self.teams.values()]
+        out["leagues"] = {str(k): v for k, v in self.leagues.items()}
+        out["synced"] = {str(k): v for k, v in self.synced_leagues.items()}
+        return out
+
+
+class CatalogueAPI(SportsAPI):
+    """Fetches teams for the catalogue."""
+
+    def search_teams(self, query: str) -> list[dict[str, Any]]:
+        """Search the API for teams by name.
+
+        The search must be at least three characters.
+        """
+        # The API only accepts letters, numbers and spaces
+        return self.get(
+            "teams?search=" + quote(normalise(query)), RequestPriority.TEAM_INFO
+        )
+
+    def get_league_teams(
+        self, league_id: int, season_number: int
+    ) -> list[dict[str, Any]]:
+        """Get every team in a league for a season."""
+        return self.get(
+            "teams?league=" + str(league_id) + "&season=" + str(season_number),
+            RequestPriority.COMPETITIONS,
+        )
+
+
+async def async_get_catalogue(hass: HomeAssistant) -> TeamCatalogue:
+    """Get the catalogue, loading it from disk the first time."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if CATALOGUE not in domain_data:
+        store: Store[dict[str, Any]] = Store(
+            hass, CATALOGUE_STORAGE_VERSION, CATALOGUE_STORAGE_KEY
+        )
+        data = await store.async_load()
+        # Another caller may have loaded it while we waited
+        if CATALOGUE not in domain_data:
+            domain_data[CATALOGUE_STORE] = store
+            domain_data[CATALOGUE] = TeamCatalogue(data)
+    return domain_data[CATALOGUE]
+
+
+def async_save_catalogue(hass: HomeAssistant):
+    """Save the catalogue to disk soon, batching up changes made close together."""
+    catalogue: TeamCatalogue = hass.data[DOMAIN][CATALOGUE]
+    store: Store[dict[str, Any]] = hass.data[DOMAIN][CATALOGUE_STORE]
+    store.async_delay_save(catalogue.to_dict, CATALOGUE_SAVE_DELAY_SECONDS)
+
+
+async def async_search_online(
+    hass: HomeAssistant, api: CatalogueAPI, query: str
+) -> list[CatalogueTeam]:
+    """Search the API for teams, adding the ones it finds to the catalogue.
+
+    The search must be at least three characters.
+    """
+    catalogue = await async_get_catalogue(hass)
+    response = await hass.async_add_executor_job(api.search_teams, query)
+    catalogue.add_teams(response)
+    async_save_catalogue(hass)
+    found = [catalogue.teams[int(item["team"]["id"])] for item in response]
+    return found[:CATALOGUE_SEARCH_LIMIT]
+
+
+async def async_sync_catalogue(
+    hass: HomeAssistant, api: CatalogueAPI, competitions: list[Competition]
+):
+    """Add the teams of each competition, skipping those already fetched this season."""
+    catalogue = await async_get_catalogue(hass)
+    season_number: int = get_season_number()
+    for competition in competitions:
+        catalogue.add_league(competition)
+        if catalogue.is_synced(competition.id, season_number):
+            continue
+
+        try:
+            response = await hass.async_add_executor_job(
+                api.get_league_teams, competition.id, season_number
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred syncing the catalogue, will carry on next time")
+            break
+        except HomeAssistantError as err:
+            _LOGGER.debug("Couldn't sync the catalogue: %s", err)
+            break
+
+        catalogue.add_teams(response, competition.id)
+        catalogue.mark_synced(competition.id, season_number)
+        _LOGGER.debug("Added %d teams from %s", len(response), competition.name)
+    async_save_catalogue(hass)
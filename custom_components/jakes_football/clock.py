@@ -0,0 +1,43 @@
+"""A swappable source of the current time.
+
+Refresh timing can then be tested without waiting for it.
+"""
+
+from datetime import datetime
+import time
+
+
+class Clock:
+    """Tells the time using the system clock."""
+
+    def now(self) -> datetime:
+        """Get the current local time."""
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        """Get seconds that only ever go up, for timing rate limits and cooldowns."""
+        return time.monotonic()
+
+
+_clock: Clock = Clock()
+
+
+def now() -> datetime:
+    """Get the current local time from the active clock."""
+    return _clock.now()
+
+
+def monotonic() -> float:
+    """Get the seconds for timing rate limits and cooldowns from the active clock."""
+    return _clock.monotonic()
+
+
+def get_clock() -> Clock:
+    """Get the active clock."""
+    return _clock
+
+
+def set_clock(clock: Clock):
+    """Replace the active clock, e.g. with one that can be moved forward on demand."""
+    global _clock  # noqa: PLW0603
+    _clock = clock
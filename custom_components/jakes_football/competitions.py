@@ -2,10 +2,13 @@
 
 from datetime import datetime
 
+from . import clock
 
-def get_season_number() -> int:
-    """Get the year of the current season (August-July)."""
-    now = datetime.now()
+
+def get_season_number(now: datetime | None = None) -> int:
+    """Get the year of the season played at a time, or now if not given (Aug-Jul)."""
+    if now is None:
+        now = clock.now()
     if now.month >= 6:
         return now.year
     else:  # noqa: RET505
@@ -15,9 +18,11 @@ def get_season_number() -> int:
 class Competitions:
     """Stores all competition a club has (or will) take part in this season."""
 
-    def __init__(self, data) -> None:
-        """Initialise base data."""
-        self.season_number = get_season_number()
+    def __init__(self, data, season_number: int | None = None) -> None:
+        """Initialise base data, for this season if a season isn't given."""
+        self.season_number = (
+            season_number if season_number is not None else get_season_number()
+        )
         self.competitions: list[Competition] = []
 
         for competition_data in data:
@@ -7,20 +7,50 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_API_KEY
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+)
 
-from .const import DOMAIN
+from .catalogue import (
+    CatalogueAPI,
+    CatalogueTeam,
+    async_get_catalogue,
+    async_search_online,
+    normalise,
+)
+from .const import (
+    CATALOGUE,
+    CONF_IN_PLAY_REFRESH_FLOOR,
+    CONF_QUIET_WINDOW_END,
+    CONF_QUIET_WINDOW_START,
+    DEFAULT_IN_PLAY_REFRESH_FLOOR,
+    DEFAULT_QUIET_WINDOW_END,
+    DEFAULT_QUIET_WINDOW_START,
+    DOMAIN,
+)
 from .exceptions import CannotConnect, InvalidAuth
 from .team import TeamAPI
 
 _LOGGER = logging.getLogger(__name__)
 
+# Option at the end of the search results to search the API for teams the catalogue
+# doesn't have
+SEARCH_ONLINE = "search_online"
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_API_KEY): str,
-        vol.Required("team_id"): str,
+        vol.Required("search"): str,
     }
 )
 
@@ -30,14 +60,43 @@ class EntryConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialise the config flow."""
+        self.api: CatalogueAPI | None = None
+        self.search: str = ""
+        self.searched_online: bool = False
+        self.matches: list[CatalogueTeam] = []
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return EntryOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the initial step."""
+        """Handle the initial step, taking the API key and a team name or ID."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            search: str = user_input["search"].strip()
             try:
-                info = await self.validate_input(self.hass, user_input)
+                # A team ID looked up on the api-football dashboard
+                if search.isdigit():
+                    await self.async_set_unique_id(search)
+                    self._abort_if_unique_id_configured()
+                    data = {CONF_API_KEY: user_input[CONF_API_KEY], "team_id": search}
+                    info = await self.validate_input(self.hass, data)
+                    return self.async_create_entry(title=info["team_name"], data=data)
+
+                api = CatalogueAPI(user_input[CONF_API_KEY])
+                await self.hass.async_add_executor_job(api.check_status)
+                catalogue = await async_get_catalogue(self.hass)
+                self.matches = catalogue.search(search)
+                if len(self.matches) == 0 and len(normalise(search)) >= 3:
+                    # Only use up a request if nothing we know of matches
+                    self.matches = await async_search_online(self.hass, api, search)
+                    self.searched_online = True
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -46,12 +105,70 @@ class EntryConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                return self.async_create_entry(title=info["team_name"], data=user_input)
+                if len(self.matches) > 0:
+                    self.api = api
+                    self.search = search
+                    return await self.async_step_team()
+                errors["search"] = "no_teams_found"
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_team(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Pick a team from the results, or search the API if the team isn't there."""
+        assert self.api is not None
+        errors: dict[str, str] = {}
+        if user_input is not None and user_input["team_id"] == SEARCH_ONLINE:
+            self.searched_online = True
+            try:
+                found = await async_search_online(self.hass, self.api, self.search)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                if len(found) > 0:
+                    self.matches = found
+                else:
+                    errors["team_id"] = "no_teams_found"
+        elif user_input is not None:
+            team_id = int(user_input["team_id"])
+            await self.async_set_unique_id(str(team_id))
+            self._abort_if_unique_id_configured()
+            team_name = next(t.name for t in self.matches if t.id == team_id)
+            return self.async_create_entry(
+                title=team_name,
+                data={CONF_API_KEY: self.api.api_key, "team_id": str(team_id)},
+            )
+
+        leagues: dict[int, str] = self.hass.data[DOMAIN][CATALOGUE].leagues
+        options = [
+            SelectOptionDict(value=str(team.id), label=team.get_label(leagues))
+            for team in self.matches
+        ]
+        if not self.searched_online and len(normalise(self.search)) >= 3:
+            options.append(
+                # The label comes from the selector.team.options translation
+                SelectOptionDict(value=SEARCH_ONLINE, label=SEARCH_ONLINE)
+            )
+        return self.async_show_form(
+            step_id="team",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        "team_id", default=options[0]["value"]
+                    ): SelectSelector(
+                        SelectSelectorConfig(options=options, translation_key="team")
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
     async def validate_input(
         self, hass: HomeAssistant, data: dict[str, Any]
     ) -> dict[str, Any]:
@@ -67,3 +184,42 @@ class EntryConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Return info that you want to store in the config entry.
         return {"team_name": team_name}
+
+
+class EntryOptionsFlow(OptionsFlow):
+    """Handle the options for a Jakes Football Tracker entry."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialise the options flow."""
+        self.entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_IN_PLAY_REFRESH_FLOOR,
+                    default=self.entry.options.get(
+                        CONF_IN_PLAY_REFRESH_FLOOR, DEFAULT_IN_PLAY_REFRESH_FLOOR
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=15)),
+                vol.Required(
+                    CONF_QUIET_WINDOW_START,
+                    default=self.entry.options.get(
+                        CONF_QUIET_WINDOW_START, DEFAULT_QUIET_WINDOW_START
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+                vol.Required(
+                    CONF_QUIET_WINDOW_END,
+                    default=self.entry.options.get(
+                        CONF_QUIET_WINDOW_END, DEFAULT_QUIET_WINDOW_END
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=options_schema)
@@ -5,5 +5,109 @@ ATTRIBUTION = "Data provided by api-football.com"
 
 TEAM_DATA = "team"
 LEAGUE_DATA = "leagues"
+CUP_DATA = "cups"
+PROFILER = "profiler"
+KEY_POOL = "key_pool"
+SCHEDULER = "scheduler"
+CATALOGUE = "catalogue"
+CATALOGUE_STORE = "catalogue_store"
+COMPETITIONS_CACHE = "competitions"  # Each entry's competitions, kept while it reloads
+
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 5
+# Stop profiling after this long even if fewer cycles have run, since tracing slows
+# down all of Home Assistant
+PROFILE_TIMEOUT_MINUTES = 30
+
+# Per-minute request limit of the free api-football plan, replaced by the limit the API
+# reports
+DEFAULT_REQUESTS_PER_MINUTE = 10
+# How long a live request waits for the rate limit before giving up
+LIVE_REQUEST_WAIT_SECONDS = 20
+
+# Maximum number of competitions refreshed at the same time
+MAX_CONCURRENT_COMPETITION_REFRESHES = 3
 
 REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS = 3
+REFRESH_FREQ_MINUTES_HALF_TIME = 10
+REFRESH_FREQ_MINUTES_BREAK_BEFORE_EXTRA_TIME = 4
+REFRESH_FREQ_MINUTES_DELAYED = 5
+REFRESH_FREQ_MINUTES_SUSPENDED = 15
+
+# Minute of each half after which the match could end at any time, so refresh at the
+# floor
+CLOSING_MINUTE_FIRST_HALF = 42
+CLOSING_MINUTE_SECOND_HALF = 85
+
+CONF_IN_PLAY_REFRESH_FLOOR = "in_play_refresh_floor"
+DEFAULT_IN_PLAY_REFRESH_FLOOR = 1.0
+
+# Hours of the day each entry's daily refreshes are spread over
+CONF_QUIET_WINDOW_START = "quiet_window_start"
+CONF_QUIET_WINDOW_END = "quiet_window_end"
+DEFAULT_QUIET_WINDOW_START = 2
+DEFAULT_QUIET_WINDOW_END = 6
+
+# Number of days before the season rolls over in June to start fetching the next
+# season's competitions
+SEASON_WARMUP_DAYS = 7
+
+# Length of a fixture, from kick off to the final whistle including half time and
+# stoppages
+FIXTURE_DURATION_MINUTES = 115
+# Length of the second half including stoppages, to time the end of a fixture from its
+# second half kick off
+SECOND_HALF_DURATION_MINUTES = 50
+# Added to the length of fixtures that go to extra time (including the break before it)
+# or penalties
+EXTRA_TIME_DURATION_MINUTES = 40
+PENALTY_SHOOTOUT_DURATION_MINUTES = 15
+
+# Number of most recent matches used for rolling form statistics
+STATS_ROLLING_WINDOW = 5
+
+# Order of the stats used to rank teams in a league, from most to least important
+DEFAULT_TIEBREAK_RULES = ("points", "goal_difference", "goals_for")
+LEAGUE_TIEBREAK_RULES: dict[int, tuple[str, ...]] = {
+    253: ("points", "games_won", "goal_difference", "goals_for"),  # MLS
+}
+
+# Monte Carlo simulation of the rest of the season
+SIMULATION_SEASONS = 5000
+SIMULATION_HOME_ADVANTAGE = 1.15  # Multiplier on the expected goals of the home team
+# Places that go straight into the Champions League or down a division. Leagues that
+# aren't listed, or have no such places, only get the chance of the title.
+LEAGUE_EUROPE_PLACES: dict[int, int] = {
+    39: 4,  # Premier League
+    61: 3,  # Ligue 1
+    78: 4,  # Bundesliga
+    88: 2,  # Eredivisie
+    94: 2,  # Primeira Liga
+    135: 4,  # Serie A
+    140: 4,  # La Liga
+}
+LEAGUE_RELEGATION_PLACES: dict[int, int] = {
+    39: 3,  # Premier League
+    40: 3,  # Championship
+    61: 2,  # Ligue 1, plus a play-off
+    78: 2,  # Bundesliga, plus a play-off
+    88: 2,  # Eredivisie, plus a play-off
+    94: 2,  # Primeira Liga, plus a play-off
+    135: 3,  # Serie A
+    140: 3,  # La Liga
+}
+
+# Local catalogue of teams used to search for a team when setting up an entry
+CATALOGUE_STORAGE_KEY = DOMAIN + ".catalogue"
+CATALOGUE_STORAGE_VERSION = 1
+CATALOGUE_SAVE_DELAY_SECONDS = 10
+CATALOGUE_SEARCH_LIMIT = 10
+# Share of the search's trigrams a team name must contain to match
+CATALOGUE_MIN_SIMILARITY = 0.5
+
+# Standings history, one row per gameweek
+HISTORY_MAX_GAMEWEEKS = 60
+# Number of gameweeks to compare over when finding the biggest movers
+HISTORY_MOVER_WINDOW = 1
+HISTORY_STORAGE_PREFIX = DOMAIN + ".standings_"
@@ -0,0 +1,73 @@
+"""Make calls to the API for a knockout competition through this object."""
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from . import clock
+from .competitions import Competition, get_season_number
+from .exceptions import RequestDeferred
+from .profiler import profiled_refresh
+from .scheduler import RequestPriority
+from .sports_api import SportsAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CupAPI(SportsAPI):
+    """Holds data for a cup competition, which has rounds instead of standings."""
+
+    def __init__(
+        self, api_key: str, competition: Competition, timeout: float = 10
+    ) -> None:
+        """Initialise base data."""
+        super().__init__(api_key, timeout)
+        self.cup_id: int = competition.id
+        self.name: str = competition.name
+        self.logo: str = competition.logo
+        self.current_round: str | None = None
+        self.last_refresh: datetime | None = None
+
+    @profiled_refresh
+    def refresh(self, force: bool = False):
+        """Try to trigger a refresh of our data."""
+        now: datetime = clock.now()
+
+        if not force and not self.planner.is_due(
+            "rounds:" + str(self.cup_id), self.last_refresh, now
+        ):
+            return  # Already refreshed today
+
+        try:
+            response_data = self.get(
+                "fixtures/rounds?league="
+                + str(self.cup_id)
+                + "&season="
+                + str(get_season_number())
+                + "&current=true",
+                RequestPriority.COMPETITIONS,
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred refreshing %s", self.name)
+            return
+        self.current_round = response_data[0] if len(response_data) > 0 else None
+
+        self.last_refresh = now
+
+    def get_unique_name(self) -> str:
+        """Get a unique name for home assistant."""
+        return self.name.replace(" ", "_").lower()
+
+    def get_current_round(self) -> str | None:
+        """Get the round currently being played."""
+        self.refresh()
+        return self.current_round
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to use as attributes."""
+        out: dict[str, Any] = {}
+        season_number: int = get_season_number()
+        out["year"] = str(season_number) + "/" + str((season_number - 2000) + 1)
+        out["logo"] = self.logo
+        out["current_round"] = self.current_round
+        return out
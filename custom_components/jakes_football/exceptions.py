@@ -13,3 +13,15 @@ class InvalidAuth(HomeAssistantError):
 
 class HTTPError(HomeAssistantError):
     """Custom error defined by a HTTP response."""
+
+
+class QuotaExceeded(HTTPError):
+    """Error to indicate the daily request quota of an API key has been used up."""
+
+
+class RateLimited(HTTPError):
+    """Error to indicate an API key has made too many requests this minute."""
+
+
+class RequestDeferred(HomeAssistantError):
+    """Error to indicate a request was held back to save the rate limit."""
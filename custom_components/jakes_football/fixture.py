@@ -1,8 +1,24 @@
 """Data types to make handling of fixtures easier."""
 
-from datetime import datetime
 from typing import Any
 
+from . import clock
+
+# Statuses of a match that has been played to completion
+FINISHED_STATUSES = ["FT", "AET", "PEN"]
+
+# Match statistics to show in attributes, the rest of the statistics are dropped
+KEY_STATISTICS = [
+    "Ball Possession",
+    "Total Shots",
+    "Shots on Goal",
+    "Corner Kicks",
+    "Fouls",
+    "Yellow Cards",
+    "Red Cards",
+    "expected_goals",
+]
+
 
 class FixtureData:
     """Stores all data for a single fixture."""
@@ -13,19 +29,77 @@ class FixtureData:
             self.is_valid = False
             return
 
-        self.fixture = Fixture(data["fixture"])
         self.competition = League(data["league"])
         self.home_team = Team(data["teams"]["home"])
         self.away_team = Team(data["teams"]["away"])
 
+        self.fixture: Fixture
         self.goals: Goals | None = None
         self.penalty_shootout: Goals | None = None
-        if self.fixture.status.short != "NS":  # NS = Not Started
-            self.goals = Goals(data["goals"])
-            self.penalty_shootout = Goals(data["score"]["penalty"])
 
+        # Only included when a single fixture is requested by id
+        self.events: list[Event] = []
+        self.lineups: list[Lineup] = []
+        self.statistics: list[TeamStatistics] = []
+
+        self.update(data)
         self.is_valid = True
 
+    def update(self, data: Any):
+        """Update the status, score and match details from json data.
+
+        Lineups are only parsed the first time they are available. Only events we
+        haven't seen yet are parsed, unless the API has changed or taken away one we
+        already have. Everything is built before any of it is stored, so the fixture is
+        never seen half updated.
+        """
+        fixture = Fixture(data["fixture"])
+
+        goals: Goals | None = None
+        penalty_shootout: Goals | None = None
+        if fixture.status.short != "NS":  # NS = Not Started
+            goals = Goals(data["goals"])
+            penalty_shootout = Goals(data["score"]["penalty"])
+
+        events = self.events
+        if "events" in data:
+            events_data = data["events"]
+            if len(events_data) >= len(events) and all(
+                event.matches(event_data)
+                for event, event_data in zip(events, events_data)
+            ):
+                events = events + [Event(e) for e in events_data[len(events) :]]
+            else:
+                # Events have been corrected or taken away (e.g. by VAR), so start again
+                events = [Event(e) for e in events_data]
+
+        lineups = self.lineups
+        if len(lineups) == 0 and "lineups" in data:
+            lineups = [Lineup(lineup_data) for lineup_data in data["lineups"]]
+
+        statistics = self.statistics
+        if "statistics" in data:
+            statistics = [
+                TeamStatistics(statistics_data)
+                for statistics_data in data["statistics"]
+            ]
+
+        self.fixture = fixture
+        self.goals = goals
+        self.penalty_shootout = penalty_shootout
+        self.events = events
+        self.lineups = lineups
+        self.statistics = statistics
+
+    def copy_details(self, other: "FixtureData"):
+        """Keep the events, lineups and statistics from another copy of this fixture."""
+        if len(self.events) == 0:
+            self.events = other.events
+        if len(self.lineups) == 0:
+            self.lineups = other.lineups
+        if len(self.statistics) == 0:
+            self.statistics = other.statistics
+
     def get_attributes(self) -> dict[str, Any]:
         """Convert this to a dict to use as attributes."""
         out: dict[str, Any] = {}
@@ -46,6 +120,15 @@ class FixtureData:
             out["penalty_shootout"] = self.penalty_shootout.get_attributes()
         else:
             out["goals"] = None
+
+        if len(self.events) > 0:
+            out["events"] = [event.get_attributes() for event in self.events]
+        if len(self.lineups) > 0:
+            out["lineups"] = [lineup.get_attributes() for lineup in self.lineups]
+        if len(self.statistics) > 0:
+            out["statistics"] = [
+                statistics.get_attributes() for statistics in self.statistics
+            ]
         return out
 
     def to_string(self):
@@ -90,7 +173,7 @@ class Fixture:
 
         # Sometimes if we update too soon after KO time the match hasn't started but the timestamp is
         # in the past so it won't refresh. Consider any NS matches within the last two hours as in play
-        now = datetime.now()
+        now = clock.now()
         now_timestamp = now.timestamp()
         two_hours = 7200
         if (
@@ -144,6 +227,7 @@ class Team:
 
     def __init__(self, data) -> None:
         """Initialise from json data."""
+        self.id = data["id"]
         self.name = data["name"]
         self.logo = data["logo"]
         self.winner = data["winner"]
@@ -151,6 +235,7 @@ class Team:
     def get_attributes(self) -> dict[str, Any]:
         """Convert this to a dict to make accessible via attributes."""
         out: dict[str, Any] = {}
+        out["id"] = self.id
         out["name"] = self.name
         out["logo"] = self.logo
         out["winner"] = self.winner
@@ -171,3 +256,82 @@ class Goals:
         out["home"] = self.home
         out["away"] = self.away
         return out
+
+
+class Event:
+    """Stores data for something that happened in a match, e.g. a goal or card."""
+
+    def __init__(self, data) -> None:
+        """Initialise from json data."""
+        self.elapsed = data["time"]["elapsed"]
+        self.extra = data["time"]["extra"]
+        self.team = data["team"]["name"]
+        self.player = data["player"]["name"]
+        self.assist = data["assist"]["name"]
+        self.type = data["type"]
+        self.detail = data["detail"]
+
+    def matches(self, data) -> bool:
+        """Check if json data describes this same event, unchanged."""
+        return (
+            self.elapsed == data["time"]["elapsed"]
+            and self.extra == data["time"]["extra"]
+            and self.team == data["team"]["name"]
+            and self.player == data["player"]["name"]
+            and self.assist == data["assist"]["name"]
+            and self.type == data["type"]
+            and self.detail == data["detail"]
+        )
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to make accessible via attributes."""
+        out: dict[str, Any] = {}
+        out["elapsed"] = self.elapsed
+        out["extra"] = self.extra
+        out["team"] = self.team
+        out["player"] = self.player
+        out["assist"] = self.assist
+        out["type"] = self.type
+        out["detail"] = self.detail
+        return out
+
+
+class Lineup:
+    """Stores a team's lineup for a match."""
+
+    def __init__(self, data) -> None:
+        """Initialise from json data."""
+        self.team = data["team"]["name"]
+        self.formation = data["formation"]
+        self.coach = data["coach"]["name"]
+        self.starting = [p["player"]["name"] for p in data["startXI"]]
+        self.substitutes = [p["player"]["name"] for p in data["substitutes"]]
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to make accessible via attributes."""
+        out: dict[str, Any] = {}
+        out["team"] = self.team
+        out["formation"] = self.formation
+        out["coach"] = self.coach
+        out["starting"] = self.starting
+        out["substitutes"] = self.substitutes
+        return out
+
+
+class TeamStatistics:
+    """Stores the key statistics of one team in a match."""
+
+    def __init__(self, data) -> None:
+        """Initialise from json data."""
+        self.team = data["team"]["name"]
+        self.statistics: dict[str, Any] = {}
+        for statistic in data["statistics"]:
+            if statistic["type"] in KEY_STATISTICS:
+                self.statistics[statistic["type"]] = statistic["value"]
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to make accessible via attributes."""
+        out: dict[str, Any] = {}
+        out["team"] = self.team
+        out["statistics"] = self.statistics
+        return out
@@ -0,0 +1,80 @@
+"""Index fixtures by the time they are played, for fast range queries."""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from .const import (
+    EXTRA_TIME_DURATION_MINUTES,
+    FIXTURE_DURATION_MINUTES,
+    PENALTY_SHOOTOUT_DURATION_MINUTES,
+    SECOND_HALF_DURATION_MINUTES,
+)
+from .fixture import FixtureData
+
+# Statuses of a match that has gone to extra time or penalties
+EXTRA_TIME_STATUSES = ["BT", "ET", "P", "AET", "PEN"]
+PENALTY_STATUSES = ["P", "PEN"]
+
+
+def get_end_timestamp(fixture: FixtureData) -> int:
+    """Get the time a fixture finished, or should finish if it hasn't yet.
+
+    Timed from the second half kick off when we know it, and lengthened for extra time
+    and penalties.
+    """
+    status: str = fixture.fixture.status.short
+    if fixture.fixture.second_half_time is not None:
+        end = fixture.fixture.second_half_time + SECOND_HALF_DURATION_MINUTES * 60
+    else:
+        end = fixture.fixture.timestamp + FIXTURE_DURATION_MINUTES * 60
+    if status in EXTRA_TIME_STATUSES:
+        end += EXTRA_TIME_DURATION_MINUTES * 60
+    if status in PENALTY_STATUSES:
+        end += PENALTY_SHOOTOUT_DURATION_MINUTES * 60
+    return end
+
+
+class FixtureIndex:
+    """An interval index over a list of fixtures.
+
+    Fixtures are sorted by kick off. Nothing lasts longer than the longest fixture, so
+    every fixture overlapping a range is found with two binary searches and a check of
+    the end times of the few fixtures near the start.
+    """
+
+    def __init__(self, fixtures: list[FixtureData]) -> None:
+        """Build the index from a list of fixtures."""
+        self.fixtures: list[FixtureData] = sorted(
+            (f for f in fixtures if f.is_valid), key=lambda x: x.fixture.timestamp
+        )
+        self.kick_offs: list[int] = [f.fixture.timestamp for f in self.fixtures]
+        self.ends: list[int] = [get_end_timestamp(f) for f in self.fixtures]
+        self.longest: int = max(
+            (end - kick_off for kick_off, end in zip(self.kick_offs, self.ends)),
+            default=FIXTURE_DURATION_MINUTES * 60,
+        )
+
+    def get_end_timestamp(self, fixture: FixtureData) -> int:
+        """Get the time a fixture finished, or should finish."""
+        return get_end_timestamp(fixture)
+
+    def get_range(self, start: datetime, end: datetime) -> list[FixtureData]:
+        """Get every fixture that is played at any point between start and end."""
+        # Anything kicking off more than the longest fixture before the start has
+        # finished by then
+        first = bisect_right(self.kick_offs, start.timestamp() - self.longest)
+        last = bisect_left(self.kick_offs, end.timestamp())
+        return [
+            self.fixtures[i]
+            for i in range(first, last)
+            if self.ends[i] > start.timestamp()
+        ]
+
+    def get_next(self, now: datetime) -> FixtureData | None:
+        """Get the fixture being played now, or the next one if there isn't one."""
+        i = bisect_right(self.kick_offs, now.timestamp() - self.longest)
+        while i < len(self.fixtures) and self.ends[i] <= now.timestamp():
+            i += 1
+        if i < len(self.fixtures):
+            return self.fixtures[i]
+        return None
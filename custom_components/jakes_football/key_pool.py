@@ -0,0 +1,194 @@
+"""Share api-football keys between config entries.
+
+Each request goes to the key with the most headroom.
+"""
+
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+import logging
+import threading
+
+from homeassistant.exceptions import HomeAssistantError
+
+from . import clock
+from .exceptions import InvalidAuth, QuotaExceeded, RateLimited
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long a key is left alone after hitting the per-minute rate limit
+RATE_LIMIT_COOLDOWN_SECONDS = 60
+
+# A rejected key is rested for a while, and only given up on after being rejected this
+# many times in a row
+REJECTED_COOLDOWN_SECONDS = 300
+MAX_KEY_REJECTIONS = 3
+
+
+class ApiKeyState:
+    """Tracks the remaining quota and health of a single key."""
+
+    def __init__(self, api_key: str) -> None:
+        """Initialise base data."""
+        self.api_key: str = api_key
+        self.entry_count: int = 0  # Number of config entries that brought this key
+        self.in_flight: int = 0
+
+        self.daily_remaining: int | None = None
+        self.minute_remaining: int | None = None
+        # clock.monotonic() of the last per-minute update
+        self.minute_updated: float = 0.0
+
+        self.invalid: bool = False
+        # Number of times in a row the API has rejected this key
+        self.rejections: int = 0
+        self.quota_reset: datetime | None = None  # Set when the daily quota has run out
+        self.cooldown_until: float = 0.0  # clock.monotonic() when rate limited
+
+    def is_usable(self, now: datetime, monotonic_now: float) -> bool:
+        """Check if requests can be sent with this key."""
+        if self.invalid:
+            return False
+        if self.quota_reset is not None:
+            if now < self.quota_reset:
+                return False
+            self.quota_reset = None  # A new day, so the quota is back
+            self.daily_remaining = None
+        return monotonic_now >= self.cooldown_until
+
+    def get_score(self, monotonic_now: float) -> tuple[bool, float, float]:
+        """Get a score for this key, higher is better. Unknown quotas count as plenty.
+
+        Keys with headroom this minute come first, then the most daily quota, then the
+        most headroom this minute.
+        """
+        minute: float = float("inf")
+        if (
+            self.minute_remaining is not None
+            and monotonic_now - self.minute_updated < RATE_LIMIT_COOLDOWN_SECONDS
+        ):
+            minute = self.minute_remaining - self.in_flight
+
+        daily: float = float("inf")
+        if self.daily_remaining is not None:
+            daily = self.daily_remaining - self.in_flight
+
+        return (minute > 0, daily, minute)
+
+
+class ApiKeyPool:
+    """A pool of api-football keys shared by every config entry."""
+
+    def __init__(self) -> None:
+        """Initialise base data."""
+        self.keys: dict[str, ApiKeyState] = {}
+        self._lock = threading.Lock()
+
+    def add_key(self, api_key: str):
+        """Add a key to the pool."""
+        with self._lock:
+            state = self.keys.setdefault(api_key, ApiKeyState(api_key))
+            state.entry_count += 1
+
+    def remove_key(self, api_key: str):
+        """Remove a key from the pool once no config entries use it."""
+        with self._lock:
+            state = self.keys.get(api_key)
+            if state is None:
+                return
+            state.entry_count -= 1
+            if state.entry_count <= 0:
+                self.keys.pop(api_key)
+
+    def acquire(self, exclude: set[str]) -> str | None:
+        """Get the best key to send a request with, or None if every key is unusable."""
+        now = clock.now().astimezone(UTC)
+        monotonic_now = clock.monotonic()
+        with self._lock:
+            best: ApiKeyState | None = None
+            best_score: tuple[bool, float, float] | None = None
+            for state in self.keys.values():
+                if state.api_key in exclude or not state.is_usable(now, monotonic_now):
+                    continue
+                score = state.get_score(monotonic_now)
+                if best_score is None or score > best_score:
+                    best = state
+                    best_score = score
+
+            if best is None:
+                return None
+            best.in_flight += 1
+            return best.api_key
+
+    def release(self, api_key: str, headers: Mapping[str, str] | None = None):
+        """Hand a key back after a request, updating its quota from the headers."""
+        with self._lock:
+            state = self.keys.get(api_key)
+            if state is None:
+                return
+            state.in_flight = max(0, state.in_flight - 1)
+            if headers is None:
+                return
+
+            daily_remaining = headers.get("x-ratelimit-requests-remaining")
+            if daily_remaining is not None:
+                state.daily_remaining = int(daily_remaining)
+
+            minute_remaining = headers.get("x-ratelimit-remaining")
+            if minute_remaining is not None:
+                state.minute_remaining = int(minute_remaining)
+                state.minute_updated = clock.monotonic()
+
+    def get_unusable_error(self) -> HomeAssistantError:
+        """Get the error that explains why no key can send a request right now."""
+        with self._lock:
+            states = list(self.keys.values())
+        if len(states) > 0 and all(s.invalid or s.rejections > 0 for s in states):
+            return InvalidAuth("No valid API keys")
+        if any(s.cooldown_until > clock.monotonic() for s in states):
+            return RateLimited("Every API key is rate limited")
+        return QuotaExceeded("No API keys with remaining quota")
+
+    def mark_accepted(self, api_key: str):
+        """Record that the API accepted a key."""
+        with self._lock:
+            if api_key in self.keys:
+                self.keys[api_key].rejections = 0
+
+    def mark_rejected(self, api_key: str):
+        """Rest a key the API rejected, and stop using it if it keeps being rejected."""
+        with self._lock:
+            state = self.keys.get(api_key)
+            if state is None:
+                return
+            state.rejections += 1
+            if state.rejections < MAX_KEY_REJECTIONS:
+                state.cooldown_until = clock.monotonic() + REJECTED_COOLDOWN_SECONDS
+                _LOGGER.info("API key ending %s was rejected, resting it", api_key[-4:])
+                return
+            state.invalid = True
+        _LOGGER.warning(
+            "API key ending %s was rejected %d times in a row, no longer using it",
+            api_key[-4:],
+            MAX_KEY_REJECTIONS,
+        )
+
+    def mark_quota_exceeded(self, api_key: str):
+        """Stop using a key until its daily quota resets at midnight UTC."""
+        _LOGGER.info("API key ending %s has used its daily quota", api_key[-4:])
+        tomorrow = clock.now().astimezone(UTC).date() + timedelta(days=1)
+        with self._lock:
+            if api_key in self.keys:
+                self.keys[api_key].quota_reset = datetime(
+                    tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=UTC
+                )
+                self.keys[api_key].daily_remaining = 0
+
+    def mark_rate_limited(self, api_key: str):
+        """Rest a key that has made too many requests this minute."""
+        _LOGGER.debug("API key ending %s is rate limited", api_key[-4:])
+        with self._lock:
+            if api_key in self.keys:
+                self.keys[api_key].cooldown_until = (
+                    clock.monotonic() + RATE_LIMIT_COOLDOWN_SECONDS
+                )
+                self.keys[api_key].minute_remaining = 0
@@ -1,10 +1,28 @@
 """Make calls to the League API through this object."""
 
 from datetime import datetime
-from typing import Any
+import logging
+import os
+from typing import TYPE_CHECKING, Any
 
+from . import clock
 from .competitions import get_season_number
+from .const import REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS
+from .exceptions import RequestDeferred
+from .fixture import FINISHED_STATUSES, FixtureData
+from .fixture_index import FixtureIndex
+from .live_table import build_live_table, get_tiebreak_rules
+from .profiler import profiled_refresh
+from .scheduler import RequestPriority
+from .simulation import get_simulation_key
 from .sports_api import SportsAPI
+from .standings_history import Mover, StandingsHistory
+from .stats import LeagueStats, TeamStats
+
+if TYPE_CHECKING:
+    from .simulation import SeasonOutcome
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class LeagueStanding:
@@ -20,6 +38,8 @@ class LeagueStanding:
         self.rank: int = int(data["rank"])
         self.points: int = int(data["points"])
         self.form: str = data["form"]
+        # True if the current score of an in-play match is included
+        self.is_live: bool = False
 
         stat_data = data["all"]
         self.games_played: int = int(stat_data["played"])
@@ -51,6 +71,7 @@ class LeagueStanding:
         out["goals_for"] = self.goals_for
         out["goals_against"] = self.goals_against
         out["goal_difference"] = self.goals_for - self.goals_against
+        out["is_live"] = self.is_live
         return out
 
 
@@ -67,32 +88,264 @@ class LeagueAPI(SportsAPI):
         self.table: list[LeagueStanding] = []
         self.last_refresh: datetime | None = None
 
+        self.fixtures: list[FixtureData] = []
+        self.stats: LeagueStats | None = None
+        self.fixture_index: FixtureIndex = FixtureIndex([])
+        self.last_fixture_refresh: datetime | None = None
+
+        # In play, or finished but not yet in the table
+        self.live_fixtures: dict[int, FixtureData] = {}
+        # Games each team had played when a fixture was first tracked
+        self.live_played: dict[int, tuple[int, int]] = {}
+        self.live_table: list[LeagueStanding] | None = None
+        self.last_live_refresh: datetime | None = None
+
+        self.season_outcomes: dict[int, SeasonOutcome] = {}
+        self.season_outcomes_key: tuple[Any, ...] | None = None
+        # The simulation key with the table and fixtures it was built from, replaced as
+        # a whole so the loop never reads one without the others
+        self.simulation_snapshot: tuple[
+            tuple[Any, ...] | None, list[LeagueStanding], list[FixtureData]
+        ] = (None, [], [])
+
+        self.history: StandingsHistory = StandingsHistory()
+        # Where to keep the history, or None to only keep it in memory
+        self.history_path: str | None = None
+
+    @profiled_refresh
     def refresh(self, force: bool = False):
         """Try to trigger a refresh of our data."""
-        now: datetime = datetime.now()
+        now: datetime = clock.now()
 
-        if force or (
-            self.last_refresh is not None and self.last_refresh.date() == now.date()
+        if not force and not self.planner.is_due(
+            "standings:" + str(self.league_id), self.last_refresh, now
         ):
             return  # Already refreshed today
 
-        r = self.get(
-            "standings?league="
-            + str(self.league_id)
-            + "&season="
-            + str(get_season_number())
-        )
-        response_data = r.json()["response"]
+        season_number: int = get_season_number()
+        try:
+            response_data = self.get(
+                "standings?league="
+                + str(self.league_id)
+                + "&season="
+                + str(season_number),
+                RequestPriority.STANDINGS,
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred refreshing standings for league %d", self.league_id)
+            return
         league_data = response_data[0]["league"]
         self.country = league_data["country"]
         self.name = league_data["name"]
         self.logo = league_data["logo"]
 
-        self.table.clear()
-        for s in league_data["standings"][0]:
-            self.table.append(LeagueStanding(s))
+        table = [LeagueStanding(s) for s in league_data["standings"][0]]
+        fixtures = self.fixtures
+        self.simulation_snapshot = (
+            get_simulation_key(table, fixtures),
+            table,
+            fixtures,
+        )
+        self.table = table
+
+        # Matches the new standings already include would otherwise be counted twice
+        self.evict_counted_fixtures()
+        self.live_table = None
+
+        gameweek: int = max((s.games_played for s in self.table), default=0)
+        self.history.record(season_number, gameweek, self.table)
+        self.save_history()
+
+        self.last_refresh = clock.now()
+
+    def load_history(self):
+        """Read the standings history from disk, if we have saved one."""
+        if self.history_path is None or not os.path.exists(self.history_path):
+            return
+        try:
+            self.history = StandingsHistory.load(self.history_path)
+        except (OSError, KeyError, ValueError) as err:
+            _LOGGER.warning("Couldn't read the standings history: %s", err)
+
+    def save_history(self):
+        """Write the standings history to disk."""
+        if self.history_path is None:
+            return
+        try:
+            self.history.save(self.history_path)
+        except OSError as err:
+            _LOGGER.warning("Couldn't save the standings history: %s", err)
+
+    def get_games_played(self, team_id: int) -> int:
+        """Get the number of games a team has played according to the standings."""
+        for standing in self.table:
+            if standing.team_id == team_id:
+                return standing.games_played
+        return 0
+
+    def update_live_fixture(self, fixture: FixtureData):
+        """Store the current score of an in-play or just finished league fixture."""
+        if not fixture.is_valid or fixture.competition.id != self.league_id:
+            return
+        fixture_id: int = fixture.fixture.id
+        status: str = fixture.fixture.status.short
+        if status in FINISHED_STATUSES:
+            if fixture_id not in self.live_fixtures:
+                return  # Never seen in play, so the standings may already include it
+        elif not fixture.fixture.is_in_play():
+            # Postponed, abandoned or cancelled, so it doesn't count
+            self.remove_live_fixture(fixture_id)
+            return
+
+        if fixture_id not in self.live_played:
+            self.live_played[fixture_id] = (
+                self.get_games_played(fixture.home_team.id),
+                self.get_games_played(fixture.away_team.id),
+            )
+        self.live_fixtures[fixture_id] = fixture
+        self.live_table = None
+
+    def remove_live_fixture(self, fixture_id: int):
+        """Stop applying the score of a fixture to the table."""
+        self.live_played.pop(fixture_id, None)
+        if self.live_fixtures.pop(fixture_id, None) is not None:
+            self.live_table = None
+
+    def evict_counted_fixtures(self):
+        """Stop applying finished fixtures once the standings include them.
+
+        A team having played more games than when its match was first tracked means
+        the result is in the table.
+        """
+        for fixture_id, fixture in list(self.live_fixtures.items()):
+            home_played, away_played = self.live_played[fixture_id]
+            if (
+                self.get_games_played(fixture.home_team.id) > home_played
+                or self.get_games_played(fixture.away_team.id) > away_played
+            ):
+                _LOGGER.debug(
+                    "Standings include fixture %d, no longer applying it", fixture_id
+                )
+                self.remove_live_fixture(fixture_id)
+
+    def is_match_window(self, now: datetime) -> bool:
+        """Check if any match in this league is being played, or is due to be."""
+        if any(
+            f.fixture.status.short not in FINISHED_STATUSES
+            for f in self.live_fixtures.values()
+        ):
+            return True
+        return len(self.fixture_index.get_range(now, now)) > 0
+
+    @profiled_refresh
+    def refresh_live_fixtures(self):
+        """Update the scores of in-play fixtures while any match is being played."""
+        now: datetime = clock.now()
+        if not self.is_match_window(now):
+            return  # Nothing in play that we know of
+
+        if (
+            self.last_live_refresh is not None
+            and (now - self.last_live_refresh).total_seconds() / 60
+            < REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS
+        ):
+            return
+
+        try:
+            response_data = self.get(
+                "fixtures?live=" + str(self.league_id), RequestPriority.LIVE
+            )
+            live_ids: set[int] = set()
+            for fixture_json in response_data:
+                fixture = FixtureData(fixture_json)
+                live_ids.add(fixture.fixture.id)
+                self.update_live_fixture(fixture)
+
+            # Anything tracked but no longer listed has ended, so get its final score
+            ended = [
+                str(i)
+                for i, f in self.live_fixtures.items()
+                if i not in live_ids and f.fixture.status.short not in FINISHED_STATUSES
+            ]
+            if len(ended) > 0:
+                response_data = self.get(
+                    "fixtures?ids=" + "-".join(ended), RequestPriority.LIVE
+                )
+                for fixture_json in response_data:
+                    self.update_live_fixture(FixtureData(fixture_json))
+        except RequestDeferred:
+            _LOGGER.debug(
+                "Deferred refreshing live fixtures for league %d", self.league_id
+            )
+            return
+
+        self.last_live_refresh = now
+
+    def get_simulation_snapshot(
+        self,
+    ) -> tuple[tuple[Any, ...] | None, list[LeagueStanding], list[FixtureData]]:
+        """Get the simulation key, table and fixtures from the same refresh."""
+        return self.simulation_snapshot
+
+    def get_live_table(self) -> list[LeagueStanding]:
+        """Get the league table with the current scores of in-play fixtures applied."""
+        self.refresh()
+        return self.get_cached_live_table()
+
+    def get_cached_live_table(self) -> list[LeagueStanding]:
+        """Get the live table without refreshing the standings.
+
+        Safe to call from the event loop.
+        """
+        if self.live_table is None:
+            self.live_table = build_live_table(
+                self.table,
+                list(self.live_fixtures.values()),
+                get_tiebreak_rules(self.league_id),
+            )
+        return self.live_table
+
+    @profiled_refresh
+    def refresh_fixtures(self, force: bool = False):
+        """Refresh the whole league's fixtures and recompute the stats from them."""
+        now: datetime = clock.now()
+
+        if not force and not self.planner.is_due(
+            "fixtures:" + str(self.league_id), self.last_fixture_refresh, now
+        ):
+            return  # Already refreshed today
+
+        try:
+            response_data = self.get(
+                "fixtures?league="
+                + str(self.league_id)
+                + "&season="
+                + str(get_season_number()),
+                RequestPriority.STANDINGS,
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred refreshing fixtures for league %d", self.league_id)
+            return
+        fixtures = [FixtureData(f) for f in response_data]
+        fixtures.sort(key=lambda x: x.fixture.timestamp)
+        self.stats = LeagueStats(fixtures)
+        self.fixture_index = FixtureIndex(fixtures)
+        table = self.table
+        self.simulation_snapshot = (
+            get_simulation_key(table, fixtures),
+            table,
+            fixtures,
+        )
+        self.fixtures = fixtures
+
+        self.last_fixture_refresh = now
 
-        self.last_refresh = datetime.now()
+    def get_team_stats(self, team_id: int) -> TeamStats | None:
+        """Get the form and performance stats of a team."""
+        self.refresh_fixtures()
+        if self.stats is None:
+            return None
+        return self.stats.get_team_stats(team_id)
 
     def get_name(self) -> str:
         """Get the name of the league."""
@@ -101,12 +354,14 @@ class LeagueAPI(SportsAPI):
         return self.name
 
     def get_unique_name(self) -> str:
-        """Get a unique name for home assistant."""
-        name: str = self.get_name()
-        if name == "":
-            return "unknown_league"
+        """Get a unique name for home assistant, or the league ID if it has no name yet.
+
+        Doesn't refresh, so it is safe to call from the event loop.
+        """
+        if self.name == "":
+            return str(self.league_id)
 
-        return name.replace(" ", "_").lower()
+        return self.name.replace(" ", "_").lower()
 
     def get_country(self) -> str:
         """Get the country of this league."""
@@ -130,8 +385,7 @@ class LeagueAPI(SportsAPI):
 
     def get_team_standing(self, team_id: int) -> LeagueStanding | None:
         """Get the current league position of a team."""
-        self.refresh()
-        for team in self.table:
+        for team in self.get_live_table():
             if team.team_id == team_id:
                 return team
         return None
@@ -144,10 +398,17 @@ class LeagueAPI(SportsAPI):
             return -1
         return team.rank
 
+    def get_position_history(self, team_id: int) -> dict[int, int]:
+        """Get a team's league position after each gameweek this season."""
+        return self.history.get_position_history(team_id)
+
+    def get_biggest_movers(self) -> tuple[Mover, Mover] | None:
+        """Get the teams that climbed and fell the furthest in the last gameweek."""
+        return self.history.get_biggest_movers()
+
     def get_league_leader(self) -> LeagueStanding | None:
         """Get the team at the top of the league."""
-        self.refresh()
-        for team in self.table:
+        for team in self.get_live_table():
             if team.rank == 1:
                 return team
         return None
@@ -160,8 +421,15 @@ class LeagueAPI(SportsAPI):
         out["country"] = self.country
         out["logo"] = self.logo
 
+        out["is_live"] = len(self.live_fixtures) > 0
+        movers = self.get_biggest_movers()
+        if movers is not None:
+            out["biggest_movers"] = {
+                "rising": movers[0].get_attributes(),
+                "falling": movers[1].get_attributes(),
+            }
         out["standings"] = []
-        for team in self.table:
+        for team in self.get_cached_live_table():
             out["standings"].append(team.get_attributes())
 
         return out
@@ -0,0 +1,95 @@
+"""Apply the scores of in-play fixtures to a cached league table."""
+
+from __future__ import annotations
+
+from bisect import insort
+import copy
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_TIEBREAK_RULES, LEAGUE_TIEBREAK_RULES
+from .fixture import FixtureData
+
+if TYPE_CHECKING:
+    from .league import LeagueStanding
+
+
+def get_tiebreak_rules(league_id: int) -> tuple[str, ...]:
+    """Get the order of the stats used to rank teams in a league."""
+    return LEAGUE_TIEBREAK_RULES.get(league_id, DEFAULT_TIEBREAK_RULES)
+
+
+def get_sort_key(standing: LeagueStanding, rules: tuple[str, ...]) -> tuple[Any, ...]:
+    """Get a key that sorts standings from first to last place."""
+    values: dict[str, int] = {
+        "points": standing.points,
+        "goal_difference": standing.get_goal_difference(),
+        "goals_for": standing.goals_for,
+        "games_won": standing.games_won,
+    }
+    return tuple(-values[rule] for rule in rules)
+
+
+def apply_live_score(
+    standing: LeagueStanding, goals_for: int, goals_against: int
+) -> LeagueStanding:
+    """Get a copy of a standing with the current score of a match added to it."""
+    live = copy.copy(standing)
+    live.is_live = True
+    live.games_played += 1
+    live.goals_for += goals_for
+    live.goals_against += goals_against
+
+    if goals_for > goals_against:
+        live.games_won += 1
+        live.points += 3
+    elif goals_for == goals_against:
+        live.games_tied += 1
+        live.points += 1
+    else:
+        live.games_lost += 1
+    return live
+
+
+def build_live_table(
+    table: list[LeagueStanding],
+    live_fixtures: list[FixtureData],
+    rules: tuple[str, ...] = DEFAULT_TIEBREAK_RULES,
+) -> list[LeagueStanding]:
+    """Build a league table with the current scores of in-play fixtures applied.
+
+    Only teams playing in the fixtures are moved, everyone else keeps their order from
+    the cached table.
+    """
+    by_team: dict[int, LeagueStanding] = {}
+    for standing in table:
+        by_team[standing.team_id] = standing
+
+    live_standings: dict[int, LeagueStanding] = {}
+    for fixture in live_fixtures:
+        if fixture.goals is None or fixture.goals.home is None:
+            continue  # Hasn't kicked off yet
+
+        home = by_team.get(fixture.home_team.id)
+        away = by_team.get(fixture.away_team.id)
+        if home is None or away is None:
+            continue  # Not a match between two teams in this table
+
+        live_standings[home.team_id] = apply_live_score(
+            home, fixture.goals.home, fixture.goals.away
+        )
+        live_standings[away.team_id] = apply_live_score(
+            away, fixture.goals.away, fixture.goals.home
+        )
+
+    if len(live_standings) == 0:
+        return table
+
+    out: list[LeagueStanding] = [
+        copy.copy(s) for s in table if s.team_id not in live_standings
+    ]
+    for standing in live_standings.values():
+        insort(out, standing, key=lambda s: get_sort_key(s, rules))
+
+    for rank, standing in enumerate(out, start=1):
+        standing.rank = rank
+    return out
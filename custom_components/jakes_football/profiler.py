@@ -0,0 +1,248 @@
+"""Profile refresh cycles on a live system to see where time and memory go."""
+
+from collections.abc import Callable, Iterator
+import contextlib
+import cProfile
+from datetime import datetime
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+from .const import PROFILE_TIMEOUT_MINUTES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of lines to show in each section of the report
+REPORT_FUNCTION_LIMIT = 50
+REPORT_MEMORY_LIMIT = 15
+
+# Leave our own allocations out of the memory report
+MEMORY_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+class RefreshProfiler:
+    """Profiles the next N refresh cycles that hit the API.
+
+    Uses cProfile for time and tracemalloc for memory.
+
+    Gives up after a timeout, writing the report with the cycles captured so far.
+    """
+
+    def __init__(self) -> None:
+        """Initialise base data."""
+        self.remaining_cycles: int = 0
+        self.output_dir: str = ""
+
+        self._lock = threading.Lock()  # Guards the collected stats
+        self._profiling = threading.Lock()  # Held by the cycle being profiled
+        self._local = threading.local()
+        self._started_tracemalloc: bool = False
+        self._timer: threading.Timer | None = None
+        self._stats: pstats.Stats | None = None
+        self._cycles: list[str] = []
+        self._memory: list[str] = []
+        self._timings: dict[str, list[float]] = {}
+
+    def is_active(self) -> bool:
+        """Check if we are capturing a profile."""
+        return self.remaining_cycles > 0
+
+    def start(
+        self,
+        cycles: int,
+        output_dir: str,
+        timeout_minutes: float = PROFILE_TIMEOUT_MINUTES,
+    ):
+        """Start profiling the next refresh cycles, writing the report to output_dir."""
+        with self._lock:
+            if self.is_active():
+                _LOGGER.warning(
+                    "Already profiling, %d cycles remaining", self.remaining_cycles
+                )
+                return
+
+            self.remaining_cycles = cycles
+            self.output_dir = output_dir
+            self._stats = None
+            self._cycles = []
+            self._memory = []
+            self._timings = {}
+
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+
+            self._timer = threading.Timer(timeout_minutes * 60, self._time_out)
+            self._timer.daemon = True
+            self._timer.start()
+
+        _LOGGER.info("Profiling the next %d refresh cycles", cycles)
+
+    def stop(self):
+        """Stop profiling now, writing the report with the cycles captured so far."""
+        with self._lock:
+            if self.is_active():
+                self._finish()
+
+    def _time_out(self):
+        """Stop profiling when the timeout is reached before every cycle has run."""
+        with self._lock:
+            if self.is_active():
+                _LOGGER.info(
+                    "Profiling timed out with %d cycles remaining",
+                    self.remaining_cycles,
+                )
+                self._finish()
+
+    def run_cycle(self, api: Any, func: Callable, *args, **kwargs) -> Any:
+        """Run a single refresh, keeping the profile if it made any requests."""
+        if getattr(self._local, "in_cycle", False):
+            # Already profiled by the cycle that called us
+            return func(api, *args, **kwargs)
+
+        # cProfile and tracemalloc are process wide, so only profile one cycle at a
+        # time. Refreshes that start while another is being profiled run without
+        # profiling rather than wait for it.
+        if not self._profiling.acquire(blocking=False):
+            return func(api, *args, **kwargs)
+        try:
+            if not self.is_active():
+                return func(api, *args, **kwargs)
+
+            name: str = type(api).__name__ + "." + func.__name__
+            requests_before: int = api.request_count
+            profile = cProfile.Profile()
+            snapshot_before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+
+            self._local.in_cycle = True
+            try:
+                return profile.runcall(func, api, *args, **kwargs)
+            finally:
+                self._local.in_cycle = False
+                duration = time.perf_counter() - start
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                requests_made = api.request_count - requests_before
+                with self._lock:
+                    # Skip the cycle if profiling stopped while it was running
+                    if requests_made > 0 and self.is_active():
+                        self._add_cycle(
+                            name,
+                            duration,
+                            requests_made,
+                            peak_memory,
+                            profile,
+                            snapshot_before,
+                        )
+        finally:
+            self._profiling.release()
+
+    def _add_cycle(
+        self,
+        name: str,
+        duration: float,
+        requests_made: int,
+        peak_memory: int,
+        profile: cProfile.Profile,
+        snapshot_before: tracemalloc.Snapshot,
+    ):
+        """Add a profiled cycle to the report."""
+        self._cycles.append(
+            f"{name}: {duration * 1000:.1f}ms, {requests_made} request(s), "
+            f"{peak_memory / 1024:.1f}KiB peak traced memory"
+        )
+
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+
+        snapshot_after = tracemalloc.take_snapshot().filter_traces(MEMORY_FILTERS)
+        snapshot_before = snapshot_before.filter_traces(MEMORY_FILTERS)
+        self._memory.append(f"--- {name} ---")
+        for stat in snapshot_after.compare_to(snapshot_before, "lineno")[
+            :REPORT_MEMORY_LIMIT
+        ]:
+            self._memory.append(str(stat))
+
+        self.remaining_cycles -= 1
+        if self.remaining_cycles == 0:
+            self._finish()
+
+    @contextlib.contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time code outside of a refresh cycle, such as building attributes."""
+        if not self.is_active():
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings.setdefault(name, []).append(time.perf_counter() - start)
+
+    def _finish(self):
+        """Write the report to disk and stop profiling."""
+        self.remaining_cycles = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        file_name = "jakes_football_profile_" + datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = os.path.join(self.output_dir, file_name + ".txt")
+
+        stats_output = io.StringIO()
+        if self._stats is not None:
+            self._stats.stream = stats_output
+            self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                REPORT_FUNCTION_LIMIT
+            )
+            self._stats.dump_stats(os.path.join(self.output_dir, file_name + ".prof"))
+
+        with open(report_path, "w", encoding="utf-8") as report:
+            report.write("Refresh cycles\n")
+            report.write("\n".join(self._cycles) + "\n\n")
+
+            report.write("Timings outside of refresh cycles\n")
+            for name, timings in self._timings.items():
+                report.write(
+                    f"{name}: {len(timings)} calls, {sum(timings) * 1000:.1f}ms total, "
+                    f"{max(timings) * 1000:.1f}ms max\n"
+                )
+            report.write("\n")
+
+            report.write("Memory still allocated after each cycle\n")
+            report.write("\n".join(self._memory) + "\n\n")
+
+            report.write("CPU profile\n")
+            report.write(stats_output.getvalue())
+
+        _LOGGER.info("Profile written to %s", report_path)
+
+
+def profiled_refresh(func: Callable) -> Callable:
+    """Profile a refresh method of a SportsAPI when its profiler is active."""
+
+    @functools.wraps(func)
+    def wrapper(api, *args, **kwargs):
+        profiler: RefreshProfiler | None = api.profiler
+        if profiler is None or not profiler.is_active():
+            return func(api, *args, **kwargs)
+        return profiler.run_cycle(api, func, *args, **kwargs)
+
+    return wrapper
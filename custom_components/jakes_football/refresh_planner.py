@@ -0,0 +1,74 @@
+"""Plan each entry's daily refreshes, so they don't all land just after midnight."""
+
+from datetime import date, datetime, time, timedelta
+import hashlib
+
+from . import clock
+from .const import DEFAULT_QUIET_WINDOW_END, DEFAULT_QUIET_WINDOW_START
+from .fixture_index import FixtureIndex
+
+
+class RefreshPlanner:
+    """Spreads an entry's daily refreshes over a quiet window, avoiding its matches.
+
+    Every task gets a fixed offset into the window, taken from a hash of the entry and
+    the task name, so different entries and different tasks refresh at different times
+    but each one refreshes at the same time every day.
+    """
+
+    def __init__(
+        self,
+        seed: str = "",
+        window_start: int = DEFAULT_QUIET_WINDOW_START,
+        window_end: int = DEFAULT_QUIET_WINDOW_END,
+    ) -> None:
+        """Initialise base data."""
+        self.seed: str = seed
+        self.window_start: int = window_start
+        self.window_end: int = window_end
+        self.fixture_index: FixtureIndex = FixtureIndex([])  # Matches to keep clear of
+
+    def get_window_seconds(self) -> int:
+        """Get the length of the quiet window, which may run past midnight."""
+        hours = (self.window_end - self.window_start) % 24
+        if hours == 0:
+            hours = 24
+        return hours * 3600
+
+    def get_offset_seconds(self, task: str) -> int:
+        """Get how far into the window a task is planned."""
+        digest = hashlib.sha256((self.seed + ":" + task).encode()).digest()
+        return int.from_bytes(digest[:8], "big") % self.get_window_seconds()
+
+    def get_planned_time(self, task: str, day: date) -> datetime:
+        """Get the time a task is planned for, in the window starting on this day."""
+        planned = datetime.combine(day, time(self.window_start)) + timedelta(
+            seconds=self.get_offset_seconds(task)
+        )
+
+        # Wait until any match being played at that time has finished
+        for fixture in self.fixture_index.get_range(planned, planned):
+            planned = max(
+                planned,
+                datetime.fromtimestamp(self.fixture_index.get_end_timestamp(fixture)),
+            )
+        return planned
+
+    def get_last_planned_time(self, task: str, now: datetime) -> datetime:
+        """Get the most recent planned time of a task that isn't in the future."""
+        day = now.date()
+        planned = self.get_planned_time(task, day)
+        while planned > now:
+            day -= timedelta(days=1)
+            planned = self.get_planned_time(task, day)
+        return planned
+
+    def is_due(
+        self, task: str, last_refresh: datetime | None, now: datetime | None = None
+    ) -> bool:
+        """Check if a task hasn't run since its last planned time."""
+        if last_refresh is None:
+            return True
+        if now is None:
+            now = clock.now()
+        return last_refresh < self.get_last_planned_time(task, now)
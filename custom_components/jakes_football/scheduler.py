@@ -0,0 +1,125 @@
+"""Share each key's per-minute rate limit between requests, putting live data first."""
+
+from collections.abc import Mapping
+from enum import IntEnum
+import logging
+import threading
+import time
+
+from . import clock
+from .const import DEFAULT_REQUESTS_PER_MINUTE, LIVE_REQUEST_WAIT_SECONDS
+from .exceptions import RequestDeferred
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """How important a request is, lowest value first."""
+
+    LIVE = 0  # The score of a match in play
+    FIXTURES = 1  # The team's season fixtures
+    STANDINGS = 2  # League tables and league-wide fixtures
+    TEAM_INFO = 3
+    COMPETITIONS = 4
+    STATUS = 5
+
+
+# Number of tokens each priority has to leave in the bucket for more important requests
+PRIORITY_RESERVE: dict[RequestPriority, int] = {
+    RequestPriority.LIVE: 0,
+    RequestPriority.FIXTURES: 1,
+    RequestPriority.STANDINGS: 2,
+    RequestPriority.TEAM_INFO: 3,
+    RequestPriority.COMPETITIONS: 3,
+    RequestPriority.STATUS: 3,
+}
+
+
+class TokenBucket:
+    """A per-minute rate limit for a single key."""
+
+    def __init__(self, requests_per_minute: int) -> None:
+        """Initialise base data."""
+        self.requests_per_minute: int = requests_per_minute
+        self.tokens: float = float(requests_per_minute)
+        self.last_fill: float = clock.monotonic()
+        self.live_waiting: int = 0
+
+    def fill(self):
+        """Add the tokens earned since the last fill."""
+        now = clock.monotonic()
+        self.tokens = min(
+            float(self.requests_per_minute),
+            self.tokens + (now - self.last_fill) * self.requests_per_minute / 60,
+        )
+        self.last_fill = now
+
+    def get_seconds_until_token(self) -> float:
+        """Get how long until there is a whole token in the bucket."""
+        return max(0.0, (1 - self.tokens) * 60 / self.requests_per_minute)
+
+
+class RequestScheduler:
+    """Sits in front of every request, deciding which can be sent now.
+
+    Low priority work is held back when the rate limit runs low.
+    """
+
+    def __init__(self) -> None:
+        """Initialise base data."""
+        self.buckets: dict[str, TokenBucket] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, api_key: str, priority: RequestPriority):
+        """Take a token to send a request with this key.
+
+        Live requests wait for a token. Everything else raises RequestDeferred rather
+        than eat into the tokens kept back for more important requests.
+        """
+        with self._condition:
+            bucket = self.buckets.setdefault(
+                api_key, TokenBucket(DEFAULT_REQUESTS_PER_MINUTE)
+            )
+            bucket.fill()
+
+            if priority != RequestPriority.LIVE:
+                if (
+                    bucket.live_waiting > 0
+                    or bucket.tokens - 1 < PRIORITY_RESERVE[priority]
+                ):
+                    _LOGGER.debug(
+                        "Deferring %s request, %.1f tokens left",
+                        priority.name,
+                        bucket.tokens,
+                    )
+                    raise RequestDeferred(priority.name)
+                bucket.tokens -= 1
+                return
+
+            # The wait itself is real time, since it holds up a real thread whichever
+            # clock is in use
+            deadline = time.monotonic() + LIVE_REQUEST_WAIT_SECONDS
+            bucket.live_waiting += 1
+            try:
+                while bucket.tokens < 1:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RequestDeferred(priority.name)
+                    self._condition.wait(
+                        min(remaining, bucket.get_seconds_until_token())
+                    )
+                    bucket.fill()
+                bucket.tokens -= 1
+            finally:
+                bucket.live_waiting -= 1
+
+    def update_limit(self, api_key: str, headers: Mapping[str, str]):
+        """Match the bucket to the per-minute limit the API reports for this key."""
+        limit = headers.get("x-ratelimit-limit")
+        if limit is None:
+            return
+
+        with self._condition:
+            bucket = self.buckets.get(api_key)
+            if bucket is not None and int(limit) > 0:
+                bucket.requests_per_minute = int(limit)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 import logging
 from typing import Any
 
@@ -10,13 +12,51 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTRIBUTION, DOMAIN, LEAGUE_DATA, TEAM_DATA
+from .const import (
+    ATTRIBUTION,
+    CUP_DATA,
+    DOMAIN,
+    LEAGUE_DATA,
+    MAX_CONCURRENT_COMPETITION_REFRESHES,
+    TEAM_DATA,
+)
+from .cup import CupAPI
 from .league import LeagueAPI
+from .simulation import SeasonOutcome, async_simulate_league
+from .stats import TeamStats
 from .team import FixtureData, TeamAPI
 from .venue import Venue
 
 _LOGGER = logging.getLogger(__name__)
 
+# Competitions are refreshed by their own sensors, so this bounds how many refresh at
+# once
+PARALLEL_UPDATES = MAX_CONCURRENT_COMPETITION_REFRESHES
+
+
+async def _async_run_concurrently(
+    hass: HomeAssistant, jobs: dict[str, Callable[[], Any]]
+) -> None:
+    """Run blocking jobs in the executor, a few at a time.
+
+    No more than MAX_CONCURRENT_COMPETITION_REFRESHES run at once.
+
+    A job that fails is logged and doesn't stop the others, its competition will try
+    again on its next update.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPETITION_REFRESHES)
+
+    async def run(job: Callable[[], Any]) -> None:
+        async with semaphore:
+            await hass.async_add_executor_job(job)
+
+    results = await asyncio.gather(
+        *(run(job) for job in jobs.values()), return_exceptions=True
+    )
+    for name, result in zip(jobs, results, strict=True):
+        if isinstance(result, Exception):
+            _LOGGER.warning("Couldn't refresh %s: %s", name, result)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -26,18 +66,35 @@ async def async_setup_entry(
     sensors: list[SensorEntity] = []
 
     teamApi: TeamAPI = hass.data[DOMAIN][entry.entry_id][TEAM_DATA]
-    await hass.async_add_executor_job(teamApi.get_team_name)
-    _LOGGER.info("Setting up sensor for %s", str(teamApi.get_team_name()))
+    team_name = await hass.async_add_executor_job(teamApi.get_team_name)
+    _LOGGER.info("Setting up sensor for %s", str(team_name))
     team = TeamSensor(hass, teamApi)
     sensors.append(team)
 
-    if hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA] is not None:
-        leagueApi: LeagueAPI = hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA]
-        await hass.async_add_executor_job(leagueApi.get_name)
-        _LOGGER.info("Setting up sensor for %s", str(leagueApi.get_name()))
-        league = LeagueSensor(hass, leagueApi)
+    leagueApis: dict[int, LeagueAPI] = hass.data[DOMAIN][entry.entry_id][LEAGUE_DATA]
+    cupApis: dict[int, CupAPI] = hass.data[DOMAIN][entry.entry_id][CUP_DATA]
+    await _async_run_concurrently(
+        hass,
+        {f"league {league_id}": api.refresh for league_id, api in leagueApis.items()}
+        | {f"cup {cup_id}": api.refresh for cup_id, api in cupApis.items()},
+    )
+
+    for leagueApi in leagueApis.values():
+        _LOGGER.info("Setting up sensor for %s", leagueApi.name)
+        league = LeagueSensor(
+            hass,
+            leagueApi,
+            teamApi.get_competition_unique_id("league", leagueApi.league_id),
+        )
         sensors.append(league)
 
+    for cupApi in cupApis.values():
+        _LOGGER.info("Setting up sensor for %s", cupApi.name)
+        cup = CupSensor(
+            hass, cupApi, teamApi.get_competition_unique_id("cup", cupApi.cup_id)
+        )
+        sensors.append(cup)
+
     async_add_entities(sensors)
 
 
@@ -46,6 +103,7 @@ class TeamSensor(SensorEntity):
 
     _attr_attribution = ATTRIBUTION
     _attr_icon = "mdi:soccer"
+    _unrecorded_attributes = frozenset({"position_history"})
 
     def __init__(self, hass: HomeAssistant, team: TeamAPI) -> None:
         """Initialise sensor attributes."""
@@ -56,8 +114,10 @@ class TeamSensor(SensorEntity):
         self.entity_id = ENTITY_ID_FORMAT.format(
             f"jft_team_{team.get_unique_team_name()}"
         )
-        self._attr_name = team.get_team_name()
-        self._attr_unique_id = self.entity_id
+        # Fetched during setup, don't block the loop refreshing it here
+        self._attr_name = team.team_name
+        # The name may not have been fetched yet
+        self._attr_unique_id = team.get_unique_id()
 
         self.name: str | None = None
         self.code: str | None = None
@@ -66,6 +126,9 @@ class TeamSensor(SensorEntity):
         self.is_national_team: bool = False
         self.logo: str | None = None
         self.venue: Venue | None = None
+        self.stats: TeamStats | None = None
+        self.season_outcome: SeasonOutcome | None = None
+        self.position_history: dict[int, int] = {}
 
         self.current_fixture: FixtureData = FixtureData()
         self.next_fixture: FixtureData = FixtureData()
@@ -77,6 +140,7 @@ class TeamSensor(SensorEntity):
         self.is_national_team = await self.hass.async_add_executor_job(
             self.team.is_national_team
         )
+        await self.hass.async_add_executor_job(self.team.warm_next_season)
 
         if not self.is_national_team:
             self._attr_native_value = await self.hass.async_add_executor_job(
@@ -93,6 +157,12 @@ class TeamSensor(SensorEntity):
         )
         self.logo = await self.hass.async_add_executor_job(self.team.get_logo)
         self.venue = await self.hass.async_add_executor_job(self.team.get_venue)
+        self.stats = await self.hass.async_add_executor_job(self.team.get_team_stats)
+        if self.team.league is not None:
+            self.season_outcome = self.team.league.season_outcomes.get(
+                self.team.team_id
+            )
+        self.position_history = self.team.get_position_history()
 
         self.current_fixture = await self.hass.async_add_executor_job(
             self.team.get_current_fixture
@@ -107,6 +177,13 @@ class TeamSensor(SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return state attributes."""
+        if self.team.profiler is not None:
+            with self.team.profiler.timed("TeamSensor.extra_state_attributes"):
+                return self._build_attributes()
+        return self._build_attributes()
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes from our cached data."""
         attributes: dict[str, Any] = {}
 
         if self.code is not None:
@@ -122,6 +199,15 @@ class TeamSensor(SensorEntity):
         if self.venue is not None:
             attributes["venue"] = self.venue.get_attributes()
 
+        if self.stats is not None:
+            attributes["stats"] = self.stats.get_attributes()
+
+        if self.season_outcome is not None:
+            attributes["season_outcome"] = self.season_outcome.get_attributes()
+
+        if len(self.position_history) > 0:
+            attributes["position_history"] = self.position_history
+
         if self.current_fixture.is_valid:
             attributes["current_fixture"] = self.current_fixture.get_attributes()
         if self.next_fixture.is_valid:
@@ -137,8 +223,11 @@ class LeagueSensor(SensorEntity):
 
     _attr_attribution = ATTRIBUTION
     _attr_icon = "mdi:format-list-bulleted"
+    # The history is kept in our own compact store, so keep the large attributes out of
+    # the recorder database
+    _unrecorded_attributes = frozenset({"standings", "biggest_movers"})
 
-    def __init__(self, hass: HomeAssistant, league: LeagueAPI) -> None:
+    def __init__(self, hass: HomeAssistant, league: LeagueAPI, unique_id: str) -> None:
         """Initialise sensor attributes."""
         SensorEntity.__init__(self)
         self.hass = hass
@@ -147,8 +236,10 @@ class LeagueSensor(SensorEntity):
         self.entity_id = ENTITY_ID_FORMAT.format(
             f"jft_league_{league.get_unique_name()}"
         )
-        self._attr_name = league.get_name()
-        self._attr_unique_id = self.entity_id
+        # Fetched during setup, don't block the loop refreshing it here
+        self._attr_name = league.name if league.name != "" else None
+        # Other entries can follow a team in the same league
+        self._attr_unique_id = unique_id
 
         self.gameweek: int = 0
         self.country: str = ""
@@ -156,12 +247,17 @@ class LeagueSensor(SensorEntity):
 
     async def async_update(self) -> None:
         """Update all of our data asynchronously, ready for when we need to show it."""
+        await self.hass.async_add_executor_job(self.league.refresh_live_fixtures)
+        await self.hass.async_add_executor_job(self.league.refresh_fixtures)
+        await async_simulate_league(self.league)
         self.gameweek = await self.hass.async_add_executor_job(self.league.get_gameweek)
         self._attr_native_value = self.gameweek
 
         self.country = await self.hass.async_add_executor_job(self.league.get_country)
 
         self.logo = await self.hass.async_add_executor_job(self.league.get_logo)
+        if self.league.name != "":
+            self._attr_name = self.league.name  # In case setup couldn't fetch it
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -169,6 +265,38 @@ class LeagueSensor(SensorEntity):
         attributes: dict[str, Any] = {}
 
         if self.league is not None:
+            if self.league.profiler is not None:
+                with self.league.profiler.timed("LeagueSensor.extra_state_attributes"):
+                    return self.league.get_attributes()
             attributes = self.league.get_attributes()
 
         return attributes
+
+
+class CupSensor(SensorEntity):
+    """Sensor to report data about a cup competition."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_icon = "mdi:trophy"
+
+    def __init__(self, hass: HomeAssistant, cup: CupAPI, unique_id: str) -> None:
+        """Initialise sensor attributes."""
+        SensorEntity.__init__(self)
+        self.hass = hass
+        self.cup = cup
+
+        self.entity_id = ENTITY_ID_FORMAT.format(f"jft_cup_{cup.get_unique_name()}")
+        self._attr_name = cup.name
+        # Other entries can follow a team in the same cup
+        self._attr_unique_id = unique_id
+
+    async def async_update(self) -> None:
+        """Update all of our data asynchronously, ready for when we need to show it."""
+        self._attr_native_value = await self.hass.async_add_executor_job(
+            self.cup.get_current_round
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return state attributes."""
+        return self.cup.get_attributes()
@@ -0,0 +1,47 @@
+"""Services for Jake's Football Tracker."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+
+from .const import (
+    ATTR_CYCLES,
+    DEFAULT_PROFILE_CYCLES,
+    DOMAIN,
+    PROFILER,
+    SERVICE_PROFILE_REFRESH,
+)
+from .profiler import RefreshProfiler
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services for this integration."""
+
+    async def async_profile_refresh(call: ServiceCall) -> None:
+        """Profile the next refresh cycles, reporting to the config directory."""
+        profiler: RefreshProfiler = hass.data[DOMAIN][PROFILER]
+        profiler.start(call.data[ATTR_CYCLES], hass.config.path())
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services for this integration."""
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESH)
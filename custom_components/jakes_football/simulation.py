@@ -0,0 +1,298 @@
+"""Simulate the rest of a league season to estimate where each team will finish."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .const import (
+    LEAGUE_EUROPE_PLACES,
+    LEAGUE_RELEGATION_PLACES,
+    SIMULATION_HOME_ADVANTAGE,
+    SIMULATION_SEASONS,
+)
+from .fixture import FINISHED_STATUSES
+from .live_table import get_tiebreak_rules
+
+if TYPE_CHECKING:
+    from .fixture import FixtureData
+    from .league import LeagueAPI, LeagueStanding
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seasons simulated per batch, to keep the size of the goal arrays down
+SIMULATION_BATCH_SIZE = 1000
+
+# Number of imaginary average games mixed into each team's record, so early season
+# strengths aren't extreme
+STRENGTH_PRIOR_GAMES = 5
+
+# Fixtures with these statuses will never be played
+UNPLAYED_STATUSES = ["CANC", "ABD", "AWD", "WO"]
+
+_executor: ProcessPoolExecutor | None = None
+
+
+class SeasonOutcome:
+    """Holds the chance of each end of season outcome for a single team.
+
+    Outcomes the league doesn't have, such as relegation, are None.
+    """
+
+    def __init__(
+        self,
+        team_id: int,
+        title: float,
+        europe: float | None,
+        relegation: float | None,
+    ) -> None:
+        """Initialise base data."""
+        self.team_id: int = team_id
+        self.title: float = title
+        self.europe: float | None = europe
+        self.relegation: float | None = relegation
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to use as attributes."""
+        out: dict[str, Any] = {}
+        out["title"] = round(self.title, 3)
+        if self.europe is not None:
+            out["europe"] = round(self.europe, 3)
+        if self.relegation is not None:
+            out["relegation"] = round(self.relegation, 3)
+        return out
+
+
+def get_europe_places(league_id: int) -> int:
+    """Get the number of places that qualify for Europe, 0 if we don't know of any."""
+    return LEAGUE_EUROPE_PLACES.get(league_id, 0)
+
+
+def get_relegation_places(league_id: int) -> int:
+    """Get the number of places that are relegated, 0 if we don't know of any."""
+    return LEAGUE_RELEGATION_PLACES.get(league_id, 0)
+
+
+def simulate_season(
+    stats: dict[str, np.ndarray],
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_expected_goals: np.ndarray,
+    away_expected_goals: np.ndarray,
+    rules: tuple[str, ...],
+    seasons: int,
+    europe_places: int,
+    relegation_places: int,
+) -> np.ndarray:
+    """Play out the remaining fixtures many times and count where each team finishes.
+
+    Runs in a worker process. Returns the chance of the title, a European place and
+    relegation for each team, which are 0 if the league has no such places.
+    """
+    rng = np.random.default_rng()
+    team_count = len(stats["points"])
+    match_count = len(home_idx)
+
+    # Map each match onto its home and away team so results can be added up with a
+    # matrix multiply
+    home_matrix = np.zeros((match_count, team_count))
+    home_matrix[np.arange(match_count), home_idx] = 1
+    away_matrix = np.zeros((match_count, team_count))
+    away_matrix[np.arange(match_count), away_idx] = 1
+
+    counts = np.zeros((3, team_count))
+    done = 0
+    while done < seasons:
+        batch = min(SIMULATION_BATCH_SIZE, seasons - done)
+        home_goals = rng.poisson(home_expected_goals, size=(batch, match_count))
+        away_goals = rng.poisson(away_expected_goals, size=(batch, match_count))
+        home_won = home_goals > away_goals
+        away_won = away_goals > home_goals
+        tied = home_goals == away_goals
+
+        final: dict[str, np.ndarray] = {
+            "points": stats["points"]
+            + (3 * home_won + tied) @ home_matrix
+            + (3 * away_won + tied) @ away_matrix,
+            "goal_difference": stats["goal_difference"]
+            + (home_goals - away_goals) @ home_matrix
+            + (away_goals - home_goals) @ away_matrix,
+            "goals_for": stats["goals_for"]
+            + home_goals @ home_matrix
+            + away_goals @ away_matrix,
+            "games_won": stats["games_won"]
+            + home_won @ home_matrix
+            + away_won @ away_matrix,
+        }
+
+        # lexsort uses the last key first, so the first rule goes last and a coin toss
+        # breaks any remaining ties
+        keys = [rng.random((batch, team_count))]
+        keys.extend(-final[rule] for rule in reversed(rules))
+        order = np.lexsort(keys, axis=-1)
+        positions = np.empty_like(order)
+        positions[np.arange(batch)[:, None], order] = np.arange(team_count)
+
+        counts[0] += np.sum(positions == 0, axis=0)
+        counts[1] += np.sum(positions < europe_places, axis=0)
+        if relegation_places > 0:
+            counts[2] += np.sum(positions >= team_count - relegation_places, axis=0)
+        done += batch
+
+    return counts / seasons
+
+
+def build_simulation_inputs(
+    league_id: int, table: list[LeagueStanding], fixtures: list[FixtureData]
+) -> tuple[Any, ...] | None:
+    """Build the inputs for simulate_season from a league's table and fixtures."""
+    if len(table) == 0:
+        return None
+
+    team_ids = [s.team_id for s in table]
+    team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+    remaining = [
+        f
+        for f in fixtures
+        if f.fixture.status.short not in FINISHED_STATUSES
+        and f.fixture.status.short not in UNPLAYED_STATUSES
+        and f.home_team.id in team_index
+        and f.away_team.id in team_index
+    ]
+    if len(remaining) == 0:
+        return None
+
+    stats: dict[str, np.ndarray] = {
+        "points": np.array([s.points for s in table], dtype=float),
+        "goal_difference": np.array(
+            [s.get_goal_difference() for s in table], dtype=float
+        ),
+        "goals_for": np.array([s.goals_for for s in table], dtype=float),
+        "games_won": np.array([s.games_won for s in table], dtype=float),
+    }
+    played = np.array([s.games_played for s in table], dtype=float)
+    goals_against = np.array([s.goals_against for s in table], dtype=float)
+
+    average_goals = max(stats["goals_for"].sum(), 1) / max(played.sum(), 1)
+    prior_goals = average_goals * STRENGTH_PRIOR_GAMES
+    attack = (stats["goals_for"] + prior_goals) / (played + STRENGTH_PRIOR_GAMES)
+    defence = (goals_against + prior_goals) / (played + STRENGTH_PRIOR_GAMES)
+    attack /= average_goals
+    defence /= average_goals
+
+    home_idx = np.array([team_index[f.home_team.id] for f in remaining])
+    away_idx = np.array([team_index[f.away_team.id] for f in remaining])
+    home_expected_goals = (
+        average_goals * attack[home_idx] * defence[away_idx] * SIMULATION_HOME_ADVANTAGE
+    )
+    away_expected_goals = (
+        average_goals * attack[away_idx] * defence[home_idx] / SIMULATION_HOME_ADVANTAGE
+    )
+
+    return (
+        stats,
+        home_idx,
+        away_idx,
+        home_expected_goals,
+        away_expected_goals,
+        get_tiebreak_rules(league_id),
+        SIMULATION_SEASONS,
+        get_europe_places(league_id),
+        get_relegation_places(league_id),
+    )
+
+
+def get_simulation_key(
+    table: list[LeagueStanding], fixtures: list[FixtureData]
+) -> tuple[Any, ...]:
+    """Get a key that changes whenever the standings or the fixture list change."""
+    return (
+        tuple(
+            (s.team_id, s.points, s.goals_for, s.goals_against, s.games_won)
+            for s in table
+        ),
+        tuple(
+            (f.fixture.id, f.fixture.status.short, f.fixture.timestamp)
+            for f in fixtures
+        ),
+    )
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get the process pool the simulations run in."""
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _start_simulation(
+    league_id: int, table: list[LeagueStanding], fixtures: list[FixtureData]
+) -> Future | None:
+    """Build the inputs and start a simulation in the process pool.
+
+    Building the inputs, opening the pool's pipes and launching its process all block,
+    so call this from a thread. Returns None if there is nothing left to simulate.
+    """
+    inputs = build_simulation_inputs(league_id, table, fixtures)
+    if inputs is None:
+        return None
+    return _get_executor().submit(simulate_season, *inputs)
+
+
+def shutdown_executor(wait: bool = False):
+    """Stop the simulation process pool, optionally waiting for the worker to exit."""
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+async def async_simulate_league(league: LeagueAPI) -> None:
+    """Update the league's season outcomes in a worker process.
+
+    Only runs if the standings or fixtures have changed.
+    """
+    # The table and fixtures are replaced rather than changed by a refresh, so these
+    # stay as they are while we wait
+    key, table, fixtures = league.get_simulation_snapshot()
+    if key == league.season_outcomes_key:
+        return
+
+    _LOGGER.debug("Simulating the rest of the season for league %d", league.league_id)
+    loop = asyncio.get_running_loop()
+    try:
+        future = await loop.run_in_executor(
+            None, _start_simulation, league.league_id, table, fixtures
+        )
+        if future is None:
+            league.season_outcomes = {}
+            league.season_outcomes_key = key
+            return
+        chances = await asyncio.wrap_future(future)
+    except BrokenProcessPool as err:
+        # The worker died, so start a new one and try again on the next update
+        _LOGGER.warning("Season simulation worker stopped: %s", err)
+        await loop.run_in_executor(None, shutdown_executor)
+        return
+
+    has_europe = get_europe_places(league.league_id) > 0
+    has_relegation = get_relegation_places(league.league_id) > 0
+    league.season_outcomes = {
+        s.team_id: SeasonOutcome(
+            s.team_id,
+            float(chances[0][i]),
+            float(chances[1][i]) if has_europe else None,
+            float(chances[2][i]) if has_relegation else None,
+        )
+        for i, s in enumerate(table)
+    }
+    league.season_outcomes_key = key
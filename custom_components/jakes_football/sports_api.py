@@ -1,10 +1,53 @@
 """Provides an interface to the api-sports API to allow us to get fixtures data."""
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+import json
+from typing import Any
 
 import requests
 
-from .exceptions import CannotConnect, HTTPError
+from homeassistant.exceptions import HomeAssistantError
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from .exceptions import (
+    CannotConnect,
+    HTTPError,
+    InvalidAuth,
+    QuotaExceeded,
+    RateLimited,
+    RequestDeferred,
+)
+from .key_pool import ApiKeyPool
+from .profiler import RefreshProfiler
+from .refresh_planner import RefreshPlanner
+from .scheduler import RequestPriority, RequestScheduler
+
+
+def get_pool_error(
+    failures: list[HomeAssistantError], key_pool: ApiKeyPool
+) -> HomeAssistantError:
+    """Choose the error to raise when no key could send a request.
+
+    Prefers the errors that will pass soonest.
+    """
+    for error_type in (RequestDeferred, RateLimited, QuotaExceeded, InvalidAuth):
+        for failure in failures:
+            if isinstance(failure, error_type):
+                return failure
+    return key_pool.get_unusable_error()
+
+
+def decode_json(content: bytes) -> Any:
+    """Decode a response body, with orjson if it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
 class SportsAPI:
@@ -15,30 +58,106 @@ class SportsAPI:
         self.base_url = "https://v3.football.api-sports.io/"
         self.api_key = api_key
         self.timeout = timeout
+        self.request_count: int = 0
+        self.profiler: RefreshProfiler | None = None
+        self.key_pool: ApiKeyPool | None = None
+        self.scheduler: RequestScheduler | None = None
+        self.planner: RefreshPlanner = RefreshPlanner()
 
-    def get_headers(self) -> Mapping[str, str | bytes]:
+        # Sends the HTTP request, can be replaced to serve recorded responses instead
+        self.http_get: Callable[..., requests.Response] = requests.get
+
+    def get_headers(self, api_key: str | None = None) -> Mapping[str, str | bytes]:
         """Return the header needed for the api-football endpoints."""
-        return {"x-apisports-key": self.api_key}
+        if api_key is None:
+            api_key = self.api_key
+        return {"x-apisports-key": api_key}
+
+    def get(
+        self, endpoint: str, priority: RequestPriority = RequestPriority.STATUS
+    ) -> Any:
+        """Fire a Get request, through the key pool and scheduler if we have them.
+
+        Returns the decoded "response" part of the body.
+        """
+        if self.key_pool is None:
+            r = self.send(endpoint, self.api_key, priority)
+            return self.check_response(r)["response"]
+
+        tried: set[str] = set()
+        failures: list[HomeAssistantError] = []
+        while True:
+            api_key = self.key_pool.acquire(tried)
+            if api_key is None:
+                raise get_pool_error(failures, self.key_pool)
+            tried.add(api_key)
 
-    def get(self, endpoint: str) -> requests.Response:
-        """Fire a Get request to the endpoint."""
-        r = requests.get(
+            try:
+                r = self.send(endpoint, api_key, priority)
+            except RequestDeferred as err:
+                # This key's rate limit is saved for more important requests, but
+                # another key may have room
+                self.key_pool.release(api_key)
+                failures.append(err)
+                continue
+            except Exception:
+                self.key_pool.release(api_key)
+                raise
+            self.key_pool.release(api_key, r.headers)
+
+            try:
+                payload = self.check_response(r)
+            except InvalidAuth as err:
+                self.key_pool.mark_rejected(api_key)
+                failures.append(err)
+            except QuotaExceeded as err:
+                self.key_pool.mark_quota_exceeded(api_key)
+                failures.append(err)
+            except RateLimited as err:
+                self.key_pool.mark_rate_limited(api_key)
+                failures.append(err)
+            else:
+                self.key_pool.mark_accepted(api_key)
+                return payload["response"]
+
+    def send(
+        self, endpoint: str, api_key: str, priority: RequestPriority
+    ) -> requests.Response:
+        """Send a single request to the endpoint with the given key."""
+        if self.scheduler is not None:
+            self.scheduler.acquire(api_key, priority)
+
+        r = self.http_get(
             self.base_url + endpoint,
-            headers=self.get_headers(),
+            headers=self.get_headers(api_key),
             timeout=self.timeout,
         )
+        self.request_count += 1
 
-        self.check_response(r)
+        if self.scheduler is not None:
+            self.scheduler.update_limit(api_key, r.headers)
         return r
 
-    def check_response(self, response):
-        """Check the response from an endpoint for errors."""
+    def check_response(self, response: requests.Response) -> dict[str, Any]:
+        """Decode the body of the response from an endpoint and check it for errors."""
         if response.status_code != 200:
             raise CannotConnect
 
-        errors = response.json()["errors"]
-        if len(errors) > 0:
-            raise HTTPError(errors)
+        payload: dict[str, Any] = decode_json(response.content)
+        errors = payload["errors"]
+        if len(errors) == 0:
+            return payload
+
+        # Errors are a dict keyed by type, e.g. {"token": "Error/Missing application
+        # key."}
+        if isinstance(errors, dict):
+            if "token" in errors:
+                raise InvalidAuth(errors)
+            if "requests" in errors:
+                raise QuotaExceeded(errors)
+            if "rateLimit" in errors:
+                raise RateLimited(errors)
+        raise HTTPError(errors)
 
     def check_status(self):
         """Hits the status endpoint and make sure it returns no errors."""
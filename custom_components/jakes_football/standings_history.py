@@ -0,0 +1,209 @@
+"""Keep a compact history of a league's standings, one row per gameweek."""
+
+from __future__ import annotations
+
+import glob
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .const import (
+    HISTORY_MAX_GAMEWEEKS,
+    HISTORY_MOVER_WINDOW,
+    HISTORY_STORAGE_PREFIX,
+)
+
+if TYPE_CHECKING:
+    from .league import LeagueStanding
+
+
+def _remove_file(path: str):
+    """Delete a file if it's there."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class Mover:
+    """A team's change in position between two gameweeks."""
+
+    def __init__(
+        self, team_id: int, team_name: str, rank_from: int, rank_to: int
+    ) -> None:
+        """Initialise base data."""
+        self.team_id: int = team_id
+        self.team_name: str = team_name
+        self.rank_from: int = rank_from
+        self.rank_to: int = rank_to
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to use as attributes."""
+        out: dict[str, Any] = {}
+        out["team_id"] = self.team_id
+        out["team_name"] = self.team_name
+        out["from"] = self.rank_from
+        out["to"] = self.rank_to
+        out["change"] = self.rank_from - self.rank_to
+        return out
+
+
+class StandingsHistory:
+    """Rank, points and goal difference of every team after every gameweek of a season.
+
+    Each stat is a fixed-width array with a row per gameweek and a column per team, so a
+    team's history is a single column and comparing two gameweeks is a subtraction of
+    two rows. A rank of 0 means no data.
+    """
+
+    def __init__(self, season_number: int = 0) -> None:
+        """Initialise an empty history for a season."""
+        self.season_number: int = 0
+        self.team_ids: np.ndarray
+        self.team_names: list[str]
+        self.rank: np.ndarray
+        self.points: np.ndarray
+        self.goal_difference: np.ndarray
+        self.clear(season_number)
+
+    def clear(self, season_number: int):
+        """Forget everything and start the history of a new season."""
+        shape = (HISTORY_MAX_GAMEWEEKS + 1, 0)
+        self.season_number = season_number
+        self.team_ids = np.zeros(0, dtype=np.int32)
+        self.team_names = []
+        self.rank = np.zeros(shape, dtype=np.int8)
+        self.points = np.zeros(shape, dtype=np.int16)
+        self.goal_difference = np.zeros(shape, dtype=np.int16)
+
+    def _get_columns(self, table: list[LeagueStanding]) -> np.ndarray:
+        """Get each team's column, adding columns for teams we haven't seen."""
+        columns = {int(team_id): i for i, team_id in enumerate(self.team_ids)}
+        new_teams = [s for s in table if s.team_id not in columns]
+        if len(new_teams) > 0:
+            new_ids = np.array([s.team_id for s in new_teams], dtype=np.int32)
+            self.team_ids = np.concatenate([self.team_ids, new_ids])
+            self.team_names.extend(s.team_name for s in new_teams)
+            padding = ((0, 0), (0, len(new_teams)))
+            self.rank = np.pad(self.rank, padding)
+            self.points = np.pad(self.points, padding)
+            self.goal_difference = np.pad(self.goal_difference, padding)
+            for s in new_teams:
+                columns[s.team_id] = len(columns)
+        return np.array([columns[s.team_id] for s in table], dtype=np.intp)
+
+    def record(self, season_number: int, gameweek: int, table: list[LeagueStanding]):
+        """Store the standings after a gameweek.
+
+        Replaces the history if the season has changed.
+        """
+        if season_number != self.season_number:
+            self.clear(season_number)
+        if len(table) == 0 or not 0 <= gameweek <= HISTORY_MAX_GAMEWEEKS:
+            return
+
+        columns = self._get_columns(table)
+        self.rank[gameweek, columns] = [s.rank for s in table]
+        self.points[gameweek, columns] = [s.points for s in table]
+        self.goal_difference[gameweek, columns] = [
+            s.get_goal_difference() for s in table
+        ]
+
+    def get_recorded_gameweeks(self) -> np.ndarray:
+        """Get every gameweek we have standings for."""
+        return np.flatnonzero((self.rank > 0).any(axis=1))
+
+    def get_position_history(self, team_id: int) -> dict[int, int]:
+        """Get a team's position after each recorded gameweek."""
+        matches = np.flatnonzero(self.team_ids == team_id)
+        if len(matches) == 0:
+            return {}
+        ranks = self.rank[:, matches[0]]
+        return {int(g): int(ranks[g]) for g in np.flatnonzero(ranks > 0)}
+
+    def get_biggest_movers(
+        self, window: int = HISTORY_MOVER_WINDOW
+    ) -> tuple[Mover, Mover] | None:
+        """Get the teams that climbed and fell furthest over the last few gameweeks."""
+        gameweeks = self.get_recorded_gameweeks()
+        if len(gameweeks) <= window:
+            return None
+
+        before = self.rank[gameweeks[-1 - window]].astype(np.int16)
+        after = self.rank[gameweeks[-1]].astype(np.int16)
+        change = np.where((before > 0) & (after > 0), before - after, 0)
+        if not change.any():
+            return None  # Nobody moved
+        riser = int(np.argmax(change))
+        faller = int(np.argmin(change))
+        return (
+            Mover(
+                int(self.team_ids[riser]),
+                self.team_names[riser],
+                int(before[riser]),
+                int(after[riser]),
+            ),
+            Mover(
+                int(self.team_ids[faller]),
+                self.team_names[faller],
+                int(before[faller]),
+                int(after[faller]),
+            ),
+        )
+
+    def save(self, path: str):
+        """Write the history to disk. Blocks, so call from the executor."""
+        # Write to a temporary file first so a crash can't leave half a history behind
+        f = tempfile.NamedTemporaryFile(  # noqa: SIM115
+            dir=os.path.dirname(path), suffix=".tmp", delete=False
+        )
+        try:
+            with f:
+                np.savez(
+                    f,
+                    season_number=np.array(self.season_number),
+                    team_ids=self.team_ids,
+                    team_names=np.array(self.team_names, dtype=str),
+                    rank=self.rank,
+                    points=self.points,
+                    goal_difference=self.goal_difference,
+                )
+            os.replace(f.name, path)
+        except BaseException:
+            _remove_file(f.name)  # Don't leave the temporary file behind
+            raise
+
+    @staticmethod
+    def get_path(directory: str, entry_id: str, league_id: int) -> str:
+        """Get where an entry keeps a league's standings history.
+
+        Each entry has its own file, so two entries following teams in the same league
+        don't overwrite each other.
+        """
+        file_name = HISTORY_STORAGE_PREFIX + entry_id + "_" + str(league_id) + ".npz"
+        return os.path.join(directory, file_name)
+
+    @classmethod
+    def remove_all(cls, directory: str, entry_id: str):
+        """Delete every standings history an entry has saved.
+
+        Blocks, so call from the executor.
+        """
+        pattern = HISTORY_STORAGE_PREFIX + glob.escape(entry_id) + "_*.npz"
+        for path in glob.glob(os.path.join(directory, pattern)):
+            _remove_file(path)
+
+    @classmethod
+    def load(cls, path: str) -> StandingsHistory:
+        """Read a history written by save. Blocks, so call from the executor."""
+        history = cls()
+        with np.load(path) as data:
+            history.season_number = int(data["season_number"])
+            history.team_ids = data["team_ids"]
+            history.team_names = [str(name) for name in data["team_names"]]
+            history.rank = data["rank"]
+            history.points = data["points"]
+            history.goal_difference = data["goal_difference"]
+        return history
@@ -0,0 +1,214 @@
+"""Compute form and performance statistics for every team in a league at once."""
+
+from typing import Any
+
+import numpy as np
+
+from .const import STATS_ROLLING_WINDOW
+from .fixture import FINISHED_STATUSES, FixtureData
+
+
+def _per_game(total: np.ndarray, played: np.ndarray) -> np.ndarray:
+    """Divide totals by games played, leaving 0 for teams that haven't played."""
+    return np.divide(
+        total,
+        played,
+        out=np.zeros(total.shape, dtype=float),
+        where=played > 0,
+    )
+
+
+class SplitStats:
+    """Holds a team's results for a subset of its matches (home, away or recent)."""
+
+    def __init__(
+        self,
+        played: int,
+        won: int,
+        tied: int,
+        lost: int,
+        points: int,
+        goals_for: int,
+        goals_against: int,
+    ) -> None:
+        """Initialise base data."""
+        self.played: int = played
+        self.won: int = won
+        self.tied: int = tied
+        self.lost: int = lost
+        self.points: int = points
+        self.goals_for: int = goals_for
+        self.goals_against: int = goals_against
+
+    def get_points_per_game(self) -> float:
+        """Get the average number of points per game."""
+        if self.played == 0:
+            return 0.0
+        return self.points / self.played
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to use as attributes."""
+        out: dict[str, Any] = {}
+        out["played"] = self.played
+        out["won"] = self.won
+        out["tied"] = self.tied
+        out["lost"] = self.lost
+        out["points"] = self.points
+        out["points_per_game"] = round(self.get_points_per_game(), 2)
+        out["goals_for"] = self.goals_for
+        out["goals_against"] = self.goals_against
+        return out
+
+
+class TeamStats:
+    """Holds the computed statistics for a single team."""
+
+    def __init__(
+        self,
+        team_id: int,
+        form: str,
+        home: SplitStats,
+        away: SplitStats,
+        recent: SplitStats,
+        goals_for_trend: float,
+        goals_against_trend: float,
+    ) -> None:
+        """Initialise base data."""
+        self.team_id: int = team_id
+        self.form: str = form
+        self.home: SplitStats = home
+        self.away: SplitStats = away
+        self.recent: SplitStats = recent
+
+        # Difference between the recent and season-long goals per game. Positive means
+        # scoring/conceding more lately
+        self.goals_for_trend: float = goals_for_trend
+        self.goals_against_trend: float = goals_against_trend
+
+    def get_attributes(self) -> dict[str, Any]:
+        """Convert this to a dict to use as attributes."""
+        out: dict[str, Any] = {}
+        out["form"] = self.form
+        out["home"] = self.home.get_attributes()
+        out["away"] = self.away.get_attributes()
+        out["recent"] = self.recent.get_attributes()
+        out["goals_for_trend"] = round(self.goals_for_trend, 2)
+        out["goals_against_trend"] = round(self.goals_against_trend, 2)
+        return out
+
+
+class LeagueStats:
+    """Computes statistics for every team in a league from its fixture list."""
+
+    def __init__(
+        self, fixtures: list[FixtureData], window: int = STATS_ROLLING_WINDOW
+    ) -> None:
+        """Initialise from the fixtures of a league's season."""
+        self.window: int = window
+        self.teams: dict[int, TeamStats] = {}
+
+        finished = [
+            f
+            for f in fixtures
+            if f.is_valid
+            and f.goals is not None
+            and f.fixture.status.short in FINISHED_STATUSES
+        ]
+        if len(finished) > 0:
+            self._compute(finished)
+
+    def _compute(self, fixtures: list[FixtureData]) -> None:
+        """Compute all metrics for every team in one pass of array operations."""
+        match_count = len(fixtures)
+        home_ids = np.array([f.home_team.id for f in fixtures], dtype=np.int64)
+        away_ids = np.array([f.away_team.id for f in fixtures], dtype=np.int64)
+        home_goals = np.array([f.goals.home for f in fixtures], dtype=np.int64)
+        away_goals = np.array([f.goals.away for f in fixtures], dtype=np.int64)
+        timestamps = np.array([f.fixture.timestamp for f in fixtures], dtype=np.int64)
+
+        team_ids, team_index = np.unique(
+            np.concatenate([home_ids, away_ids]), return_inverse=True
+        )
+        team_count = len(team_ids)
+
+        # Flatten into one row per team per match, home rows first then away rows
+        team = team_index
+        goals_for = np.concatenate([home_goals, away_goals])
+        goals_against = np.concatenate([away_goals, home_goals])
+        won = goals_for > goals_against
+        tied = goals_for == goals_against
+        lost = goals_for < goals_against
+        points = np.where(won, 3, np.where(tied, 1, 0))
+        is_home = np.arange(2 * match_count) < match_count
+
+        def split(mask: np.ndarray) -> dict[str, np.ndarray]:
+            """Sum up each metric per team for the rows in the mask."""
+            idx = team[mask]
+            return {
+                "played": np.bincount(idx, minlength=team_count),
+                "won": np.bincount(idx, weights=won[mask], minlength=team_count),
+                "tied": np.bincount(idx, weights=tied[mask], minlength=team_count),
+                "lost": np.bincount(idx, weights=lost[mask], minlength=team_count),
+                "points": np.bincount(idx, weights=points[mask], minlength=team_count),
+                "goals_for": np.bincount(
+                    idx, weights=goals_for[mask], minlength=team_count
+                ),
+                "goals_against": np.bincount(
+                    idx, weights=goals_against[mask], minlength=team_count
+                ),
+            }
+
+        home = split(is_home)
+        away = split(~is_home)
+
+        # Sort rows by team, then by kick off time so each team's matches are contiguous
+        # and in order
+        order = np.lexsort((np.concatenate([timestamps, timestamps]), team))
+        played = home["played"] + away["played"]
+        group_end = np.cumsum(played)
+        matches_from_end = group_end[team[order]] - np.arange(2 * match_count)
+        recent_mask = np.zeros(2 * match_count, dtype=bool)
+        recent_mask[order] = matches_from_end <= self.window
+        recent = split(recent_mask)
+
+        season_goals_for = _per_game(home["goals_for"] + away["goals_for"], played)
+        season_goals_against = _per_game(
+            home["goals_against"] + away["goals_against"], played
+        )
+        goals_for_trend = (
+            _per_game(recent["goals_for"], recent["played"]) - season_goals_for
+        )
+        goals_against_trend = (
+            _per_game(recent["goals_against"], recent["played"]) - season_goals_against
+        )
+
+        results = np.where(won, "W", np.where(tied, "D", "L"))[order]
+        group_start = group_end - played
+
+        for i, team_id in enumerate(team_ids.tolist()):
+            form_start = max(int(group_start[i]), int(group_end[i]) - self.window)
+            self.teams[team_id] = TeamStats(
+                team_id=team_id,
+                form="".join(results[form_start : group_end[i]].tolist()),
+                home=self._to_split(home, i),
+                away=self._to_split(away, i),
+                recent=self._to_split(recent, i),
+                goals_for_trend=float(goals_for_trend[i]),
+                goals_against_trend=float(goals_against_trend[i]),
+            )
+
+    def _to_split(self, arrays: dict[str, np.ndarray], i: int) -> SplitStats:
+        """Pull a single team's row out of the per-team arrays."""
+        return SplitStats(
+            played=int(arrays["played"][i]),
+            won=int(arrays["won"][i]),
+            tied=int(arrays["tied"][i]),
+            lost=int(arrays["lost"][i]),
+            points=int(arrays["points"][i]),
+            goals_for=int(arrays["goals_for"][i]),
+            goals_against=int(arrays["goals_against"][i]),
+        )
+
+    def get_team_stats(self, team_id: int) -> TeamStats | None:
+        """Get the statistics for a single team."""
+        return self.teams.get(team_id)
@@ -1,14 +1,22 @@
 """Provides an interface for API calls for a single team."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import StrEnum
 import logging
+import threading
 
-from .competitions import Competitions, get_season_number
-from .const import REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS
+from . import clock
+from .cadence import get_in_play_refresh_minutes
+from .competitions import Competition, Competitions, get_season_number
+from .const import DEFAULT_IN_PLAY_REFRESH_FLOOR, SEASON_WARMUP_DAYS
+from .exceptions import RequestDeferred
 from .fixture import FixtureData
+from .fixture_index import FixtureIndex
 from .league import LeagueAPI
+from .profiler import profiled_refresh
+from .scheduler import RequestPriority
 from .sports_api import SportsAPI
+from .stats import TeamStats
 from .venue import Venue
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,11 +32,18 @@ class TeamType(StrEnum):
 class TeamAPI(SportsAPI):
     """An interface for API calls for a single team."""
 
-    def __init__(self, api_key: str, team_id: int, timeout: float = 10) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        team_id: int,
+        timeout: float = 10,
+        in_play_refresh_floor: float = DEFAULT_IN_PLAY_REFRESH_FLOOR,
+    ) -> None:
         """Initialise base data."""
         SportsAPI.__init__(self, api_key, timeout)
 
         self.team_id: int = team_id
+        self.in_play_refresh_floor: float = in_play_refresh_floor
         self.team_name: str | None = None
         self.team_type: TeamType = TeamType.CLUB
         self.code: str | None = None
@@ -38,13 +53,18 @@ class TeamAPI(SportsAPI):
         self.venue: Venue | None = None
 
         self.competitions: Competitions | None = None
+        self.next_competitions: Competitions | None = None
+        self.last_season_warmup: datetime | None = None
         self.league: LeagueAPI | None = None
 
-        self.last_team_refresh = None
+        self.last_team_refresh: datetime | None = None
         self.last_fixture_refresh = None
+        # The team sensor and calendar both refresh fixtures
+        self.fixture_lock = threading.Lock()
         self.next_fixture: FixtureData = FixtureData()
         self.current_fixture: FixtureData = FixtureData()
         self.previous_fixture: FixtureData = FixtureData()
+        self.fixture_index: FixtureIndex = FixtureIndex([])
 
     def get_team_name(self) -> str | None:
         """Get the team name from the teams endpoint."""
@@ -53,11 +73,30 @@ class TeamAPI(SportsAPI):
         return self.team_name
 
     def get_unique_team_name(self) -> str:
-        """Lowercase version of get_team_name() with no spaces."""
-        team_name = self.get_team_name()
-        if team_name is not None:
-            return team_name.replace(" ", "_").lower()
-        return "unknown_team"
+        """Lowercase team name with no spaces, or the team ID if the name isn't known.
+
+        Doesn't refresh, so it is safe to call from the event loop.
+        """
+        if self.team_name is not None:
+            return self.team_name.replace(" ", "_").lower()
+        return str(self.team_id)
+
+    def get_unique_id(self) -> str:
+        """Get a unique id for an entity of this team.
+
+        Doesn't depend on anything fetched from the API.
+        """
+        return "jft_team_" + str(self.team_id)
+
+    def get_competition_unique_id(
+        self, competition_type: str, competition_id: int
+    ) -> str:
+        """Get a unique id for an entity of one of this team's competitions.
+
+        Includes the team ID, since other entries can follow teams in the same
+        competition.
+        """
+        return f"jft_{competition_type}_{competition_id}_{self.team_id}"
 
     def get_team_code(self) -> str | None:
         """Get the three letter code from this team."""
@@ -97,16 +136,20 @@ class TeamAPI(SportsAPI):
             self.refresh_team_info()
         return self.venue
 
+    @profiled_refresh
     def refresh_team_info(self):
         """Refresh information about this team."""
-        if (
-            self.last_team_refresh is not None
-            and self.last_team_refresh.date() == datetime.now().date()
-        ):
+        if not self.planner.is_due("team", self.last_team_refresh):
             return  # Already refreshed today
 
-        r = self.get("teams?id=" + str(self.team_id))
-        response_data = r.json()["response"]
+        try:
+            response_data = self.get(
+                "teams?id=" + str(self.team_id), RequestPriority.TEAM_INFO
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred refreshing team info")
+            return
+
         team_data = response_data[0]["team"]
         self.team_name = team_data["name"]
         self.code = team_data["code"]
@@ -122,6 +165,8 @@ class TeamAPI(SportsAPI):
         venue_data = response_data[0]["venue"]
         self.venue = Venue(venue_data)
 
+        self.last_team_refresh = clock.now()
+
     def get_current_fixture(self) -> FixtureData:
         """Return data about the current fixture. Refresh if needs to. Check FixtureData.is_valid to make sure there is a current fixture."""
         self.refresh_fixture_data()
@@ -137,26 +182,62 @@ class TeamAPI(SportsAPI):
         self.refresh_fixture_data()
         return self.previous_fixture
 
+    @profiled_refresh
     def refresh_fixture_data(self):
         """Refresh our cached fixture data."""
+        with self.fixture_lock:
+            try:
+                self._refresh_fixture_data()
+            except RequestDeferred:
+                # Nothing has been changed yet, so try again on the next update
+                _LOGGER.debug("Deferred refreshing fixtures")
+
+    def _refresh_fixture_data(self):
+        """Refresh our cached fixture data while holding the fixture lock."""
         if not self.should_refresh_fixtures():
             return
 
+        if self.current_fixture.is_valid and not self.planner.is_due(
+            "fixtures", self.last_fixture_refresh
+        ):
+            # While a match is on, one request for just that fixture gets the score
+            # along with the match details
+            self.refresh_current_fixture()
+            if self.current_fixture.fixture.is_in_play():
+                self.last_fixture_refresh = clock.now()
+                if self.league is not None:
+                    self.league.update_live_fixture(self.current_fixture)
+                return
+            # Otherwise the match has finished, so refresh everything to move on to the
+            # next fixture
+
+        fixtures = self.get(
+            "fixtures?team="
+            + str(self.team_id)
+            + "&season="
+            + str(get_season_number()),
+            RequestPriority.FIXTURES,
+        )
+
         match_was_in_progress = self.current_fixture.is_valid
+        last_current_fixture = self.current_fixture
         self.current_fixture = FixtureData()
         self.next_fixture = FixtureData()
         self.previous_fixture = FixtureData()
 
-        r = self.get(
-            "fixtures?team=" + str(self.team_id) + "&season=" + str(get_season_number())
-        )
-        fixtures = r.json()["response"]
         fixtures.sort(key=lambda x: x["fixture"]["timestamp"])
         _LOGGER.debug("Found %d fixtures", len(fixtures))
 
-        now = datetime.now()
+        now = clock.now()
+        season_fixtures: list[FixtureData] = []
         for fixture_json in fixtures:
             fixture_data: FixtureData = FixtureData(fixture_json)
+            season_fixtures.append(fixture_data)
+            if (
+                last_current_fixture.is_valid
+                and fixture_data.fixture.id == last_current_fixture.fixture.id
+            ):
+                fixture_data.copy_details(last_current_fixture)
             if fixture_data.fixture.is_in_play():
                 _LOGGER.debug("Found fixture in play - %s", fixture_data.to_string())
                 self.current_fixture = fixture_data
@@ -174,8 +255,22 @@ class TeamAPI(SportsAPI):
             ):
                 self.previous_fixture = fixture_data
 
+        self.fixture_index = FixtureIndex(season_fixtures)
+        self.planner.fixture_index = self.fixture_index
         self.last_fixture_refresh = now
 
+        if self.league is not None:
+            # Keep the league's live table in step with our match, keeping the final
+            # score until the standings show it
+            for fixture_data in season_fixtures:
+                if (
+                    last_current_fixture.is_valid
+                    and fixture_data.fixture.id == last_current_fixture.fixture.id
+                ):
+                    self.league.update_live_fixture(fixture_data)
+            if self.current_fixture.is_valid:
+                self.league.update_live_fixture(self.current_fixture)
+
         if (
             match_was_in_progress
             and not self.current_fixture.is_valid  # Match was in progress but has now ended
@@ -187,6 +282,16 @@ class TeamAPI(SportsAPI):
             self.league.refresh(
                 True
             )  # Force a refresh of the league because the standings may have changed
+            self.league.refresh_fixtures(True)
+
+    def refresh_current_fixture(self):
+        """Update the current fixture's score, status, events, lineups and stats."""
+        response_data = self.get(
+            "fixtures?id=" + str(self.current_fixture.fixture.id), RequestPriority.LIVE
+        )
+        if len(response_data) == 0:
+            return
+        self.current_fixture.update(response_data[0])
 
     def should_refresh_fixtures(self) -> bool:
         """Check if we need to hit the API again."""
@@ -195,7 +300,7 @@ class TeamAPI(SportsAPI):
             _LOGGER.debug("TRUE - No last refresh recorded")
             return True
 
-        now: datetime = datetime.now()
+        now: datetime = clock.now()
         time_since_refresh = now - self.last_fixture_refresh
 
         # Update more frequently if a match is in progress
@@ -203,21 +308,26 @@ class TeamAPI(SportsAPI):
             self.current_fixture.fixture.is_in_play()
             or self.current_fixture.fixture.timestamp <= now.timestamp()
         ):
-            refresh_frequency: int = REFRESH_FREQ_MINUTES_MATCH_IN_PROGRESS
-            if self.current_fixture.fixture.status in ["HT", "BT"]:
-                refresh_frequency = 15
+            refresh_frequency: float = get_in_play_refresh_minutes(
+                self.current_fixture.fixture.status, self.in_play_refresh_floor
+            )
 
-            should_refresh = (time_since_refresh.seconds / 60) >= refresh_frequency
+            should_refresh = (
+                time_since_refresh.total_seconds() / 60
+            ) >= refresh_frequency
             _LOGGER.debug(
-                "%s - Fixture in play and time since last refresh was %d seconds",
+                "%s - Fixture in play (%s) and time since last refresh was %d seconds, "
+                "refreshing every %.1f minutes",
                 "TRUE" if should_refresh else "FALSE",
-                time_since_refresh.seconds,
+                self.current_fixture.fixture.status.short,
+                time_since_refresh.total_seconds(),
+                refresh_frequency,
             )
             return should_refresh
 
-        # Update if we haven't updated today
-        if self.last_fixture_refresh.date() != now.date():
-            _LOGGER.debug("TRUE - We haven't refreshed today")
+        # Update once a day, at the time planned for this entry
+        if self.planner.is_due("fixtures", self.last_fixture_refresh, now):
+            _LOGGER.debug("TRUE - Daily refresh is due")
             return True
 
         # Update if our upcoming fixture is now in the past
@@ -231,18 +341,85 @@ class TeamAPI(SportsAPI):
         _LOGGER.debug("FALSE")
         return False
 
+    @profiled_refresh
     def get_competitions(self) -> Competitions | None:
         """Get all competitions for this season."""
+        season_number: int = get_season_number()
         if (
             self.competitions is not None
-            and self.competitions.season_number == get_season_number()
+            and self.competitions.season_number == season_number
         ):
             return self.competitions
 
-        r = self.get("leagues?team=" + str(self.team_id))
-        self.competitions = Competitions(r.json()["response"])
+        if (
+            self.next_competitions is not None
+            and self.next_competitions.season_number == season_number
+        ):
+            # Fetched ahead of the season rolling over
+            self.competitions = self.next_competitions
+            self.next_competitions = None
+            return self.competitions
+
+        try:
+            response_data = self.get(
+                "leagues?team=" + str(self.team_id), RequestPriority.COMPETITIONS
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred refreshing competitions")
+            return self.competitions
+
+        self.competitions = Competitions(response_data)
         return self.competitions
 
+    @profiled_refresh
+    def warm_next_season(self):
+        """Fetch next season's competitions in the days before the season rolls over.
+
+        Runs at this entry's planned time.
+        """
+        now: datetime = clock.now()
+        next_season: int = get_season_number(now) + 1
+        if (
+            self.next_competitions is not None
+            and self.next_competitions.season_number == next_season
+            and len(self.next_competitions.competitions) > 0
+        ):
+            return  # Already fetched
+
+        warmup_start = datetime(next_season, 6, 1) - timedelta(days=SEASON_WARMUP_DAYS)
+        if now < warmup_start:
+            return
+
+        # Try once a day until the API lists next season's competitions
+        last_warmup = warmup_start
+        if self.last_season_warmup is not None:
+            last_warmup = max(last_warmup, self.last_season_warmup)
+        if not self.planner.is_due("next_season", last_warmup, now):
+            return
+
+        try:
+            response_data = self.get(
+                "leagues?team=" + str(self.team_id), RequestPriority.COMPETITIONS
+            )
+        except RequestDeferred:
+            _LOGGER.debug("Deferred fetching next season's competitions")
+            return
+
+        self.competitions = Competitions(response_data)
+        self.next_competitions = Competitions(response_data, next_season)
+        self.last_season_warmup = now
+        _LOGGER.debug(
+            "Found %d competitions for next season",
+            len(self.next_competitions.competitions),
+        )
+
+    def get_current_competitions(self) -> list[Competition]:
+        """Get every competition this team is in this season."""
+        competition_list = self.get_competitions()
+        if competition_list is None:
+            return []
+        return competition_list.competitions
+
     def get_league_competition(self):
         """Get the league competition this season.
 
@@ -262,3 +439,15 @@ class TeamAPI(SportsAPI):
         if self.league is None:
             return -1
         return self.league.get_team_position(self.team_id)
+
+    def get_position_history(self) -> dict[int, int]:
+        """Get our league position after each gameweek this season."""
+        if self.league is None:
+            return {}
+        return self.league.get_position_history(self.team_id)
+
+    def get_team_stats(self) -> TeamStats | None:
+        """Get this team's form and performance stats, from the league's fixtures."""
+        if self.league is None:
+            return None
+        return self.league.get_team_stats(self.team_id)
@@ -0,0 +1 @@
+"""Tests for the Jake's Football Tracker integration."""
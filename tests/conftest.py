@@ -0,0 +1,51 @@
+"""Fixtures shared by the integration's tests."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from datetime import datetime
+
+import pytest
+
+from custom_components.jakes_football import clock
+from custom_components.jakes_football.simulation import shutdown_executor
+
+from .loop_stall import LoopStallDetector
+from .replay import KICK_OFF, ReplayClock, Timeline, get_builtin_scenario
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let Home Assistant load the integration from custom_components."""
+    return
+
+
+@pytest.fixture
+def replay_clock() -> Generator[ReplayClock]:
+    """Swap in a clock that only moves when told to, starting at the replay kick off."""
+    replay_clock = ReplayClock(KICK_OFF)
+    previous_clock = clock.get_clock()
+    clock.set_clock(replay_clock)
+    yield replay_clock
+    clock.set_clock(previous_clock)
+
+
+@pytest.fixture
+def simulation_executor() -> Generator[None]:
+    """Stop the season simulation worker once the test is done with it."""
+    yield
+    shutdown_executor(wait=True)
+
+
+@pytest.fixture
+def kick_off_scenario() -> tuple[Timeline, datetime, datetime]:
+    """Get the timeline around a kick off and the period to replay it over."""
+    return get_builtin_scenario("kick-off")
+
+
+@pytest.fixture
+async def loop_stall_detector() -> AsyncGenerator[LoopStallDetector]:
+    """Record anything that holds up the event loop for the rest of the test."""
+    with LoopStallDetector(asyncio.get_running_loop()) as detector:
+        yield detector
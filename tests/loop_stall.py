@@ -0,0 +1,160 @@
+"""Detect anything that holds up the event loop while the integration runs on it.
+
+Any request, file or socket access or sleep made from the event loop freezes all of Home
+Assistant, so the detector records every one it finds and where it was made, without
+needing a network connection or any quota.
+"""
+
+import asyncio
+import builtins
+import linecache
+import os
+import socket
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any
+
+from custom_components import jakes_football
+from custom_components.jakes_football.sports_api import SportsAPI
+
+# How long the loop can go without running a callback before it counts as stalled
+LOOP_STALL_THRESHOLD_SECONDS = 0.1
+
+# Blocking calls that should never be made from the event loop
+BLOCKING_CALLS: list[tuple[Any, str]] = [
+    (builtins, "open"),
+    (os, "stat"),
+    (os, "listdir"),
+    (socket, "create_connection"),
+    (socket, "getaddrinfo"),
+    (socket.socket, "connect"),
+    (time, "sleep"),
+]
+
+PACKAGE_DIR = os.path.dirname(jakes_football.__file__)
+
+
+def get_package_stack(frame: FrameType | None) -> list[str]:
+    """Format a stack, keeping the integration's frames and the call the stack ends in.
+
+    Walks the frames by hand, since the traceback module reads the source files and that
+    would be caught too.
+    """
+    lines: list[str] = []
+    innermost = True
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__ and (filename.startswith(PACKAGE_DIR) or innermost):
+            lines.append(f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}")
+            innermost = False
+        frame = frame.f_back
+    lines.reverse()
+    return lines
+
+
+class LoopProblem:
+    """A stall of the event loop, or a blocking call made from it."""
+
+    def __init__(self, description: str, stack: list[str]) -> None:
+        """Initialise base data."""
+        self.description: str = description
+        self.stack: list[str] = stack
+
+    def __repr__(self) -> str:
+        """Format the problem for assertion messages."""
+        return "\n".join([self.description] + ["    " + line for line in self.stack])
+
+
+class LoopStallDetector:
+    """Watches an event loop from another thread and records anything that holds it up.
+
+    A watchdog thread keeps scheduling a callback on the loop. If it doesn't run within
+    the threshold, the loop thread's stack is captured to show what is holding it up.
+    Calls that always block (requests, file and socket access, sleeps) are also patched
+    while the detector is running, so they are caught even when they happen to be quick.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        threshold: float = LOOP_STALL_THRESHOLD_SECONDS,
+    ) -> None:
+        """Initialise base data."""
+        self.loop = loop
+        self.threshold: float = threshold
+        self.problems: list[LoopProblem] = []
+        self.loop_thread_id: int | None = None
+        self._stopped = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._patches: list[tuple[Any, str, Any]] = []
+
+    def __enter__(self) -> "LoopStallDetector":
+        """Start watching. Must be called from the loop's thread."""
+        self.loop_thread_id = threading.get_ident()
+        for owner, name in BLOCKING_CALLS:
+            self.patch(owner, name, owner.__name__ + "." + name)
+        self._stopped.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop_stall_watchdog", daemon=True
+        )
+        self._watchdog.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop watching and undo the patches."""
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+
+    def patch(self, owner: Any, name: str, label: str):
+        """Record a problem whenever owner.name is called from the loop."""
+        original = getattr(owner, name)
+        detector = self
+
+        def guarded(*args, **kwargs):
+            caller = sys._getframe(1)  # noqa: SLF001
+            # The test loop runs in debug mode, which reads source lines through
+            # linecache to record where each task was created
+            if (
+                threading.get_ident() == detector.loop_thread_id
+                and caller.f_code.co_filename != linecache.__file__
+            ):
+                detector.problems.append(
+                    LoopProblem(
+                        "Blocking call to " + label + " from the event loop",
+                        get_package_stack(caller),
+                    )
+                )
+            return original(*args, **kwargs)
+
+        self._patches.append((owner, name, original))
+        setattr(owner, name, guarded)
+
+    def guard_api(self, api: SportsAPI):
+        """Record a problem whenever this API sends a request from the loop."""
+        self.patch(api, "send", type(api).__name__ + ".send")
+
+    def _watch(self):
+        """Keep checking the loop responds within the threshold."""
+        while not self._stopped.is_set():
+            responded = threading.Event()
+            sent = time.monotonic()
+            self.loop.call_soon_threadsafe(responded.set)
+            if not responded.wait(self.threshold):
+                frame = sys._current_frames().get(self.loop_thread_id)  # noqa: SLF001
+                stack = get_package_stack(frame)
+                while not responded.wait(self.threshold):
+                    if self._stopped.is_set():
+                        return  # The loop is waiting for us to stop
+                self.problems.append(
+                    LoopProblem(
+                        f"Event loop stalled for {time.monotonic() - sent:.3f}s",
+                        stack,
+                    )
+                )
+            self._stopped.wait(self.threshold / 2)
@@ -0,0 +1,501 @@
+"""Replay fixture timelines against the API classes at accelerated speed.
+
+Counts how many requests and refresh cycles each scenario costs, without waiting for
+real time or using any quota.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+import json
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from custom_components.jakes_football import clock
+from custom_components.jakes_football.clock import Clock
+from custom_components.jakes_football.competitions import get_season_number
+from custom_components.jakes_football.key_pool import ApiKeyPool
+from custom_components.jakes_football.league import LeagueAPI
+from custom_components.jakes_football.scheduler import RequestScheduler
+from custom_components.jakes_football.team import TeamAPI
+
+# How often Home Assistant polls the sensors
+UPDATE_INTERVAL = timedelta(seconds=30)
+
+IN_PLAY_STATUSES = ["1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"]
+
+# Kick off of the synthetic match the built in scenarios are played around
+KICK_OFF = datetime(2024, 10, 5, 15, 0)
+
+# The period each built in scenario replays
+BUILTIN_PERIODS: dict[str, tuple[datetime, datetime]] = {
+    "kick-off": (KICK_OFF - timedelta(minutes=30), KICK_OFF + timedelta(minutes=20)),
+    "half-time": (KICK_OFF + timedelta(minutes=40), KICK_OFF + timedelta(minutes=70)),
+    "full-time": (KICK_OFF + timedelta(minutes=100), KICK_OFF + timedelta(hours=3)),
+    "day rollover": (datetime(2024, 10, 8, 22), datetime(2024, 10, 9, 7)),
+    "season rollover": (datetime(2025, 5, 31, 22), datetime(2025, 6, 1, 7)),
+}
+
+
+class ReplayClock(Clock):
+    """A clock that only moves when told to."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialise base data."""
+        self.current: datetime = start
+
+    def now(self) -> datetime:
+        """Get the current replay time."""
+        return self.current
+
+    def monotonic(self) -> float:
+        """Get the replay time in seconds, so rate limits refill as the replay goes."""
+        return self.current.timestamp()
+
+    def advance(self, delta: timedelta):
+        """Move the clock forward."""
+        self.current += delta
+
+
+class ReplayResponse:
+    """Looks enough like a requests.Response for SportsAPI."""
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        """Initialise base data."""
+        self.status_code: int = 200
+        self.headers: dict[str, str] = {}
+        self.content: bytes = json.dumps(payload).encode()
+
+    def json(self) -> Any:
+        """Decode the body, giving a new copy every call like requests does."""
+        return json.loads(self.content)
+
+
+class Timeline:
+    """Recorded API data for one team, with snapshots of fixtures and standings.
+
+    The file format is: { "name": "...", "start": "<iso time>", "end": "<iso time>",
+    "team": <an item from the teams endpoint>, "competitions": [<items from the leagues
+    endpoint>], "standings": [{"at": "<iso time>", "response": <standings response>}],
+    "fixtures": [{"at": "<iso time>", "season": 2024, "response": [<fixtures>]}] } Each
+    request is answered from the latest snapshot taken at or before the replay time.
+    """
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """Initialise from json data."""
+        self.name: str = data.get("name", "recorded")
+        self.start: datetime | None = (
+            datetime.fromisoformat(data["start"]) if "start" in data else None
+        )
+        self.end: datetime | None = (
+            datetime.fromisoformat(data["end"]) if "end" in data else None
+        )
+        self.team: dict[str, Any] = data["team"]
+        self.competitions: list[dict[str, Any]] = data["competitions"]
+
+        self.standings: list[tuple[datetime, list[Any]]] = sorted(
+            (
+                (datetime.fromisoformat(s["at"]), s["response"])
+                for s in data["standings"]
+            ),
+            key=lambda x: x[0],
+        )
+        self.fixtures: list[tuple[datetime, int, list[Any]]] = sorted(
+            (
+                (datetime.fromisoformat(f["at"]), int(f["season"]), f["response"])
+                for f in data["fixtures"]
+            ),
+            key=lambda x: x[0],
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "Timeline":
+        """Load a recorded timeline."""
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    def get_team_id(self) -> int:
+        """Get the id of the recorded team."""
+        return int(self.team["team"]["id"])
+
+    def get_standings(self, now: datetime) -> list[Any]:
+        """Get the latest standings at this time."""
+        latest: list[Any] = []
+        for at, response in self.standings:
+            if at > now:
+                break
+            latest = response
+        return latest
+
+    def get_fixtures(self, now: datetime, season: int) -> list[Any]:
+        """Get the latest fixtures of a season at this time."""
+        latest: list[Any] = []
+        for at, fixture_season, response in self.fixtures:
+            if at > now:
+                break
+            if fixture_season == season:
+                latest = response
+        return latest
+
+
+class ReplayServer:
+    """Answers api-football requests from a timeline, counting every request."""
+
+    def __init__(self, timeline: Timeline, replay_clock: ReplayClock) -> None:
+        """Initialise base data."""
+        self.timeline: Timeline = timeline
+        self.clock: ReplayClock = replay_clock
+        self.requests: Counter[str] = Counter()
+        self.team: TeamAPI | None = None  # The team as it was left at the end
+
+    def get(self, url: str, **kwargs) -> ReplayResponse:
+        """Answer a Get request."""
+        parsed = urlparse(url)
+        endpoint = parsed.path.strip("/")
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        self.requests[endpoint + "?" + "&".join(sorted(params))] += 1
+
+        return ReplayResponse(
+            {"errors": [], "response": self.get_response(endpoint, params)}
+        )
+
+    def get_response(self, endpoint: str, params: dict[str, str]) -> Any:
+        """Build the response for an endpoint."""
+        now = self.clock.now()
+        if endpoint == "teams":
+            return [self.timeline.team]
+        if endpoint == "leagues":
+            return self.timeline.competitions
+        if endpoint == "standings":
+            return self.timeline.get_standings(now)
+        if endpoint == "fixtures/rounds":
+            return ["Regular Season - 1"]
+        if endpoint != "fixtures":
+            return []
+
+        season = int(params.get("season", get_season_number(now)))
+        fixtures = self.timeline.get_fixtures(now, season)
+        if "live" in params:
+            fixtures = self.timeline.get_fixtures(now, get_season_number(now))
+            return [
+                f
+                for f in fixtures
+                if str(f["league"]["id"]) == params["live"]
+                and f["fixture"]["status"]["short"] in IN_PLAY_STATUSES
+            ]
+        if "id" in params:
+            fixtures = self.timeline.get_fixtures(now, get_season_number(now))
+            return [f for f in fixtures if str(f["fixture"]["id"]) == params["id"]]
+        if "ids" in params:
+            fixtures = self.timeline.get_fixtures(now, get_season_number(now))
+            ids = params["ids"].split("-")
+            return [f for f in fixtures if str(f["fixture"]["id"]) in ids]
+        if "league" in params:
+            return [f for f in fixtures if str(f["league"]["id"]) == params["league"]]
+        if "team" in params:
+            return [
+                f
+                for f in fixtures
+                if params["team"]
+                in (str(f["teams"]["home"]["id"]), str(f["teams"]["away"]["id"]))
+            ]
+        return fixtures
+
+
+class ReplayReport:
+    """The cost of a replayed scenario."""
+
+    def __init__(self, name: str, start: datetime, end: datetime) -> None:
+        """Initialise base data."""
+        self.name: str = name
+        self.start: datetime = start
+        self.end: datetime = end
+        self.updates: int = 0
+        self.refresh_cycles: int = 0  # Updates that made at least one request
+        self.requests: Counter[str] = Counter()
+
+
+def run_update(team: TeamAPI):
+    """Do the same work as one poll of the team and league sensors."""
+    team.is_national_team()
+    team.warm_next_season()
+    # Picks up the warmed competitions once the season rolls over
+    team.get_competitions()
+    team.get_league_position()
+    team.get_team_name()
+    team.get_venue()
+    team.get_team_stats()
+    team.get_current_fixture()
+    team.get_next_fixture()
+    team.get_previous_fixture()
+
+    if team.league is not None:
+        team.league.refresh_live_fixtures()
+        team.league.get_gameweek()
+        team.league.refresh_fixtures()
+        team.league.get_attributes()
+
+
+def run_scenario(
+    name: str,
+    timeline: Timeline,
+    start: datetime,
+    end: datetime,
+    step: timedelta = UPDATE_INTERVAL,
+) -> ReplayReport:
+    """Replay a timeline from start to end, polling every step."""
+    replay_clock = ReplayClock(start)
+    server = ReplayServer(timeline, replay_clock)
+    report = ReplayReport(name, start, end)
+
+    previous_clock = clock.get_clock()
+    clock.set_clock(replay_clock)
+    try:
+        # Share a key pool and scheduler like the integration does, timed by the replay
+        # clock
+        key_pool = ApiKeyPool()
+        key_pool.add_key("replay")
+        scheduler = RequestScheduler()
+
+        team = TeamAPI("replay", timeline.get_team_id())
+        team.http_get = server.get
+        team.key_pool = key_pool
+        team.scheduler = scheduler
+        league_comp = team.get_league_competition()
+        if league_comp is not None:
+            team.league = LeagueAPI("replay", league_comp.id)
+            team.league.http_get = server.get
+            team.league.key_pool = key_pool
+            team.league.scheduler = scheduler
+        server.requests.clear()  # Setup isn't part of the scenario
+
+        while replay_clock.now() < end:
+            requests_before = sum(server.requests.values())
+            run_update(team)
+            report.updates += 1
+            if sum(server.requests.values()) > requests_before:
+                report.refresh_cycles += 1
+            replay_clock.advance(step)
+    finally:
+        clock.set_clock(previous_clock)
+
+    report.requests = server.requests
+    report.team = team
+    return report
+
+
+def make_team(team_id: int, name: str) -> dict[str, Any]:
+    """Build a team as returned inside a fixture."""
+    return {"id": team_id, "name": name, "logo": "", "winner": None}
+
+
+def make_fixture(
+    fixture_id: int,
+    league_id: int,
+    season: int,
+    home: dict[str, Any],
+    away: dict[str, Any],
+    kick_off: datetime,
+    status: str,
+    elapsed: int | None,
+    goals: tuple[int, int] | None,
+) -> dict[str, Any]:
+    """Build a fixture as returned by the fixtures endpoint."""
+    return {
+        "fixture": {
+            "id": fixture_id,
+            "timestamp": int(kick_off.timestamp()),
+            "date": kick_off.isoformat(),
+            "timezone": "UTC",
+            "periods": {"first": None, "second": None},
+            "venue": {"name": "Replay Stadium", "city": "Replay City"},
+            "status": {"long": status, "short": status, "elapsed": elapsed},
+        },
+        "league": {
+            "id": league_id,
+            "name": "Replay League",
+            "round": "Regular Season - 1",
+            "season": season,
+        },
+        "teams": {"home": home, "away": away},
+        "goals": {
+            "home": goals[0] if goals is not None else None,
+            "away": goals[1] if goals is not None else None,
+        },
+        "score": {"penalty": {"home": None, "away": None}},
+    }
+
+
+def make_standing(
+    team: dict[str, Any], rank: int, points: int, played: int
+) -> dict[str, Any]:
+    """Build a team's row as returned by the standings endpoint."""
+    return {
+        "team": {"id": team["id"], "name": team["name"], "logo": ""},
+        "rank": rank,
+        "points": points,
+        "form": "",
+        "all": {
+            "played": played,
+            "win": points // 3,
+            "draw": points % 3,
+            "lose": played - points // 3 - points % 3,
+            "goals": {"for": played, "against": played},
+        },
+    }
+
+
+def get_match_state(minutes: float) -> tuple[str, int | None, tuple[int, int] | None]:
+    """Get the synthetic match's status, minute and score this long after kick off."""
+    if minutes < 0:
+        return ("NS", None, None)
+    if minutes < 47:
+        elapsed = min(int(minutes) + 1, 45)
+        return ("1H", elapsed, (1, 0) if elapsed > 20 else (0, 0))
+    if minutes < 62:
+        return ("HT", 45, (1, 0))
+    if minutes < 110:
+        elapsed = min(int(minutes) - 16, 90)
+        return ("2H", elapsed, (1, 1) if elapsed > 70 else (1, 0))
+    return ("FT", 90, (1, 1))
+
+
+def build_synthetic_timeline(
+    kick_off: datetime, start: datetime, end: datetime, name: str
+) -> Timeline:
+    """Build a timeline for a team with a match at kick_off.
+
+    Snapshotted every minute between start and end.
+    """
+    team_id, opponent_id, league_id = 1, 2, 1000
+    home = make_team(team_id, "Replay United")
+    away = make_team(opponent_id, "Replay City")
+
+    def standings(points: tuple[int, int], played: int) -> list[Any]:
+        return [
+            {
+                "league": {
+                    "id": league_id,
+                    "name": "Replay League",
+                    "country": "Replayland",
+                    "logo": "",
+                    "standings": [
+                        [
+                            make_standing(home, 1, points[0], played),
+                            make_standing(away, 2, points[1], played),
+                        ]
+                    ],
+                }
+            }
+        ]
+
+    seasons = sorted({get_season_number(start), get_season_number(end)})
+    fixtures: list[dict[str, Any]] = []
+    at = start - timedelta(days=1)
+    while at <= end:
+        for season in seasons:
+            # Each season has a match a week before, the match at kick off, and a match
+            # a week after
+            season_kick_off = kick_off.replace(
+                year=kick_off.year + season - get_season_number(kick_off)
+            )
+            status, elapsed, goals = get_match_state(
+                (at - season_kick_off).total_seconds() / 60
+            )
+            fixtures.append(
+                {
+                    "at": at.isoformat(),
+                    "season": season,
+                    "response": [
+                        make_fixture(
+                            season * 10 + 1,
+                            league_id,
+                            season,
+                            home,
+                            away,
+                            season_kick_off - timedelta(days=7),
+                            "FT",
+                            90,
+                            (2, 0),
+                        ),
+                        make_fixture(
+                            season * 10 + 2,
+                            league_id,
+                            season,
+                            home,
+                            away,
+                            season_kick_off,
+                            status,
+                            elapsed,
+                            goals,
+                        ),
+                        make_fixture(
+                            season * 10 + 3,
+                            league_id,
+                            season,
+                            home,
+                            away,
+                            season_kick_off + timedelta(days=7),
+                            "NS",
+                            None,
+                            None,
+                        ),
+                    ],
+                }
+            )
+        at += timedelta(minutes=1)
+
+    match_finished = kick_off + timedelta(minutes=115)
+    return Timeline(
+        {
+            "name": name,
+            "team": {
+                "team": {
+                    "id": team_id,
+                    "name": home["name"],
+                    "code": "RPL",
+                    "country": "Replayland",
+                    "founded": 1900,
+                    "national": False,
+                    "logo": "",
+                },
+                "venue": {
+                    "id": 1,
+                    "name": "Replay Stadium",
+                    "address": "",
+                    "city": "Replay City",
+                    "capacity": 1000,
+                    "surface": "grass",
+                    "image": "",
+                },
+            },
+            "competitions": [
+                {
+                    "league": {
+                        "id": league_id,
+                        "name": "Replay League",
+                        "type": "League",
+                        "logo": "",
+                    },
+                    "seasons": [{"year": season} for season in seasons],
+                }
+            ],
+            "standings": [
+                {
+                    # Before the match, even when the replay starts after it
+                    "at": (min(start, kick_off) - timedelta(days=1)).isoformat(),
+                    "response": standings((3, 0), 1),
+                },
+                {
+                    "at": match_finished.isoformat(),
+                    "response": standings((4, 1), 2),
+                },
+            ],
+            "fixtures": fixtures,
+        }
+    )
+
+
+def get_builtin_scenario(name: str) -> tuple[Timeline, datetime, datetime]:
+    """Get a built in scenario's timeline and the period to replay it over."""
+    start, end = BUILTIN_PERIODS[name]
+    return (build_synthetic_timeline(KICK_OFF, start, end, name), start, end)
@@ -0,0 +1,116 @@
+"""Tests for finding teams by name in the local catalogue."""
+
+from typing import Any
+
+from custom_components.jakes_football.catalogue import TeamCatalogue, normalise
+from custom_components.jakes_football.competitions import Competition
+
+
+def make_team_item(
+    team_id: int, name: str, code: str | None = None, country: str = "England"
+) -> dict[str, Any]:
+    """Build a team as returned by the teams endpoint."""
+    return {
+        "team": {
+            "id": team_id,
+            "name": name,
+            "code": code,
+            "country": country,
+            "national": False,
+            "logo": "",
+        }
+    }
+
+
+def make_catalogue() -> TeamCatalogue:
+    """Build a catalogue of a few teams in two leagues."""
+    catalogue = TeamCatalogue()
+    catalogue.add_teams(
+        [
+            make_team_item(33, "Manchester United", "MUN"),
+            make_team_item(50, "Manchester City", "MAC"),
+            make_team_item(40, "Liverpool", "LIV"),
+        ],
+        39,
+    )
+    catalogue.add_teams(
+        [make_team_item(530, "Atlético Madrid", "ATM", "Spain")],
+        140,
+    )
+    return catalogue
+
+
+def search(catalogue: TeamCatalogue, query: str) -> list[int]:
+    """Get the ids of the teams a search finds, best first."""
+    return [team.id for team in catalogue.search(query)]
+
+
+def test_normalise() -> None:
+    """Accents, case and punctuation don't matter."""
+    assert normalise("Atlético  Madrid!") == "atletico madrid"
+    assert normalise("Brighton & Hove Albion") == "brighton hove albion"
+
+
+def test_search_by_prefix() -> None:
+    """The start of any word of a name, or the team's code, finds it."""
+    catalogue = make_catalogue()
+
+    assert search(catalogue, "manc") == [50, 33]
+    assert search(catalogue, "united") == [33]
+    assert search(catalogue, "LIV") == [40]
+    assert search(catalogue, "atletico") == [530]
+    assert search(catalogue, "") == []
+
+
+def test_whole_name_ranks_first() -> None:
+    """A search for a team's whole name puts it above teams sharing a word."""
+    catalogue = make_catalogue()
+
+    assert search(catalogue, "Manchester United")[0] == 33
+
+
+def test_search_with_typo() -> None:
+    """Names containing most of the search still match."""
+    catalogue = make_catalogue()
+
+    assert search(catalogue, "liverpoool") == [40]
+    assert search(catalogue, "xyz") == []
+
+
+def test_renamed_team_is_indexed_again() -> None:
+    """A team fetched again under a new name is found by it, keeping its leagues."""
+    catalogue = make_catalogue()
+
+    catalogue.add_teams([make_team_item(40, "Liverpool FC", "LIV")])
+
+    assert catalogue.teams[40].league_ids == {39}
+    assert search(catalogue, "liverpool fc") == [40]
+    assert len(catalogue.teams) == 4
+
+
+def test_round_trip() -> None:
+    """A catalogue loaded from to_dict finds the same teams."""
+    catalogue = make_catalogue()
+    catalogue.add_league(
+        Competition(
+            {
+                "league": {
+                    "id": 39,
+                    "name": "Premier League",
+                    "type": "League",
+                    "logo": "",
+                }
+            },
+            2024,
+        )
+    )
+    catalogue.mark_synced(39, 2024)
+
+    loaded = TeamCatalogue(catalogue.to_dict())
+
+    assert loaded.is_synced(39, 2024)
+    assert not loaded.is_synced(39, 2025)
+    assert search(loaded, "manc") == [50, 33]
+    assert loaded.teams[50].get_label(loaded.leagues) == (
+        "Manchester City (England, Premier League)"
+    )
@@ -0,0 +1,101 @@
+"""Tests for finding fixtures by the time they are played."""
+
+from datetime import datetime, timedelta
+
+from custom_components.jakes_football.const import (
+    EXTRA_TIME_DURATION_MINUTES,
+    FIXTURE_DURATION_MINUTES,
+)
+from custom_components.jakes_football.fixture import FixtureData
+from custom_components.jakes_football.fixture_index import (
+    FixtureIndex,
+    get_end_timestamp,
+)
+
+from .replay import KICK_OFF, make_fixture, make_team
+
+HOME = make_team(1, "Home")
+AWAY = make_team(2, "Away")
+
+
+def make_index_fixture(
+    fixture_id: int, kick_off: datetime, status: str = "NS"
+) -> FixtureData:
+    """Build a fixture kicking off at a time."""
+    return FixtureData(
+        make_fixture(fixture_id, 39, 2024, HOME, AWAY, kick_off, status, None, None)
+    )
+
+
+def get_ids(fixtures: list[FixtureData]) -> list[int]:
+    """Get the id of each fixture."""
+    return [f.fixture.id for f in fixtures]
+
+
+def get_next_id(index: FixtureIndex, now: datetime) -> int | None:
+    """Get the id of the fixture being played now or next, if there is one."""
+    fixture = index.get_next(now)
+    return fixture.fixture.id if fixture is not None else None
+
+
+def test_end_timestamp() -> None:
+    """Fixtures last the usual length, plus extra time if they go to it."""
+    kick_off = int(KICK_OFF.timestamp())
+
+    normal = make_index_fixture(1, KICK_OFF, "FT")
+    extra_time = make_index_fixture(2, KICK_OFF, "AET")
+
+    assert get_end_timestamp(normal) == kick_off + FIXTURE_DURATION_MINUTES * 60
+    assert get_end_timestamp(extra_time) == kick_off + 60 * (
+        FIXTURE_DURATION_MINUTES + EXTRA_TIME_DURATION_MINUTES
+    )
+
+
+def test_get_range() -> None:
+    """Every fixture played at any point in the range is found, in kick off order."""
+    index = FixtureIndex(
+        [
+            make_index_fixture(3, KICK_OFF + timedelta(days=1)),
+            make_index_fixture(1, KICK_OFF - timedelta(days=1)),
+            make_index_fixture(2, KICK_OFF),
+            FixtureData(),  # Not valid, so never indexed
+        ]
+    )
+
+    assert get_ids(index.fixtures) == [1, 2, 3]
+    # Still being played an hour in, but not three hours in
+    in_play = KICK_OFF + timedelta(hours=1)
+    assert get_ids(index.get_range(in_play, in_play)) == [2]
+    finished = KICK_OFF + timedelta(hours=3)
+    assert index.get_range(finished, finished) == []
+    assert get_ids(
+        index.get_range(KICK_OFF - timedelta(days=2), KICK_OFF + timedelta(days=2))
+    ) == [1, 2, 3]
+
+
+def test_get_range_finds_long_fixtures() -> None:
+    """A fixture that went to extra time is still found near its later end."""
+    index = FixtureIndex(
+        [
+            make_index_fixture(1, KICK_OFF, "AET"),
+            make_index_fixture(2, KICK_OFF + timedelta(hours=1)),
+        ]
+    )
+    at = KICK_OFF + timedelta(minutes=FIXTURE_DURATION_MINUTES + 10)
+
+    assert get_ids(index.get_range(at, at)) == [1, 2]
+
+
+def test_get_next() -> None:
+    """The fixture in play is next until it ends, then the one after it."""
+    index = FixtureIndex(
+        [
+            make_index_fixture(1, KICK_OFF),
+            make_index_fixture(2, KICK_OFF + timedelta(days=7)),
+        ]
+    )
+
+    assert get_next_id(index, KICK_OFF - timedelta(days=1)) == 1
+    assert get_next_id(index, KICK_OFF + timedelta(hours=1)) == 1
+    assert get_next_id(index, KICK_OFF + timedelta(hours=3)) == 2
+    assert get_next_id(index, KICK_OFF + timedelta(days=8)) is None
@@ -0,0 +1,128 @@
+"""Tests for following the scores of a league's fixtures while they are played."""
+
+from datetime import timedelta
+from typing import Any
+
+from custom_components.jakes_football.fixture import FixtureData
+from custom_components.jakes_football.fixture_index import FixtureIndex
+from custom_components.jakes_football.league import LeagueAPI, LeagueStanding
+
+from .replay import (
+    KICK_OFF,
+    ReplayClock,
+    ReplayResponse,
+    make_fixture,
+    make_standing,
+    make_team,
+)
+
+LEAGUE_ID = 39
+HOME = make_team(1, "Home")
+AWAY = make_team(2, "Away")
+
+
+def make_league_fixture(
+    status: str, goals: tuple[int, int] | None = (1, 0)
+) -> FixtureData:
+    """Build the league's only fixture in a state."""
+    return FixtureData(
+        make_fixture(100, LEAGUE_ID, 2024, HOME, AWAY, KICK_OFF, status, None, goals)
+    )
+
+
+def make_league(played: int = 3) -> LeagueAPI:
+    """Build a league whose table has both teams after this many games."""
+    league = LeagueAPI("key", LEAGUE_ID)
+    league.table = [
+        LeagueStanding(make_standing(HOME, 1, 3 * played, played)),
+        LeagueStanding(make_standing(AWAY, 2, 0, played)),
+    ]
+    league.fixture_index = FixtureIndex([make_league_fixture("NS", None)])
+    return league
+
+
+def get_points(league: LeagueAPI) -> list[tuple[int, int]]:
+    """Get the team id and points of each row of the live table."""
+    return [(s.team_id, s.points) for s in league.get_cached_live_table()]
+
+
+def test_finished_fixture_not_seen_in_play_is_ignored() -> None:
+    """A result the standings may already include isn't applied again."""
+    league = make_league()
+
+    league.update_live_fixture(make_league_fixture("FT"))
+
+    assert league.live_fixtures == {}
+
+
+def test_postponed_fixture_is_dropped() -> None:
+    """A fixture that stops being played no longer counts."""
+    league = make_league()
+    league.update_live_fixture(make_league_fixture("1H"))
+
+    league.update_live_fixture(make_league_fixture("PST", None))
+
+    assert league.live_fixtures == {}
+    assert league.live_played == {}
+    assert get_points(league) == [(1, 9), (2, 0)]
+
+
+def test_finished_fixture_applies_until_standings_include_it() -> None:
+    """The final score stays in the table until the standings count the match."""
+    league = make_league()
+    league.update_live_fixture(make_league_fixture("2H"))
+    league.update_live_fixture(make_league_fixture("FT"))
+
+    league.evict_counted_fixtures()
+    assert list(league.live_fixtures) == [100]
+    assert get_points(league) == [(1, 12), (2, 0)]
+
+    league.table = make_league(played=4).table
+    league.live_table = None
+    league.evict_counted_fixtures()
+    assert league.live_fixtures == {}
+    assert get_points(league) == [(1, 12), (2, 0)]
+
+
+def test_match_window(replay_clock: ReplayClock) -> None:
+    """Matches are due while a fixture is scheduled or a tracked one is unfinished."""
+    league = make_league()
+
+    assert league.is_match_window(KICK_OFF + timedelta(minutes=30))
+    assert not league.is_match_window(KICK_OFF - timedelta(minutes=30))
+    assert not league.is_match_window(KICK_OFF + timedelta(hours=3))
+
+    # Running late, but still being played
+    league.update_live_fixture(make_league_fixture("ET"))
+    assert league.is_match_window(KICK_OFF + timedelta(hours=3))
+    league.update_live_fixture(make_league_fixture("AET"))
+    assert not league.is_match_window(KICK_OFF + timedelta(hours=3))
+
+
+def test_refresh_fetches_ended_fixtures(replay_clock: ReplayClock) -> None:
+    """A tracked fixture missing from the live list is fetched for its final score."""
+    league = make_league()
+    league.update_live_fixture(make_league_fixture("2H"))
+    replay_clock.advance(timedelta(minutes=110))
+    requests: list[str] = []
+
+    def get(url: str, **kwargs) -> ReplayResponse:
+        endpoint = url.removeprefix(league.base_url)
+        requests.append(endpoint)
+        response: list[Any] = []
+        if endpoint == "fixtures?ids=100":
+            response = [
+                make_fixture(
+                    100, LEAGUE_ID, 2024, HOME, AWAY, KICK_OFF, "FT", 90, (2, 1)
+                )
+            ]
+        return ReplayResponse({"errors": [], "response": response})
+
+    league.http_get = get
+    league.refresh_live_fixtures()
+
+    assert requests == ["fixtures?live=39", "fixtures?ids=100"]
+    fixture = league.live_fixtures[100]
+    assert fixture.fixture.status.short == "FT"
+    assert fixture.goals is not None
+    assert (fixture.goals.home, fixture.goals.away) == (2, 1)
@@ -0,0 +1,99 @@
+"""Tests for applying in-play scores to a league table."""
+
+from custom_components.jakes_football.fixture import FixtureData
+from custom_components.jakes_football.league import LeagueStanding
+from custom_components.jakes_football.live_table import build_live_table
+
+from .replay import KICK_OFF, make_fixture, make_standing, make_team
+
+TEAMS = [make_team(team_id, "Team " + str(team_id)) for team_id in range(1, 5)]
+
+
+def make_table(points: list[int]) -> list[LeagueStanding]:
+    """Build a table with each team on the given points, after three games."""
+    return [
+        LeagueStanding(make_standing(TEAMS[i], i + 1, points[i], 3))
+        for i in range(len(points))
+    ]
+
+
+def make_live_fixture(
+    home: int, away: int, goals: tuple[int, int] | None, status: str = "2H"
+) -> FixtureData:
+    """Build a fixture between two of the teams, numbered from 1."""
+    return FixtureData(
+        make_fixture(
+            home * 10 + away,
+            39,
+            2024,
+            TEAMS[home - 1],
+            TEAMS[away - 1],
+            KICK_OFF,
+            status,
+            60,
+            goals,
+        )
+    )
+
+
+def test_applies_scores_and_reorders() -> None:
+    """A win moves the team above everyone it has caught up with."""
+    table = make_table([9, 7, 6, 4])
+
+    live = build_live_table(table, [make_live_fixture(4, 2, (2, 0))])
+
+    assert [s.team_id for s in live] == [1, 4, 2, 3]
+    assert [s.rank for s in live] == [1, 2, 3, 4]
+    winner = live[1]
+    assert (winner.points, winner.games_played, winner.games_won) == (7, 4, 2)
+    assert winner.is_live
+    loser = live[2]
+    assert (loser.points, loser.games_played, loser.games_lost) == (7, 4, 1)
+    assert loser.is_live
+    assert not live[0].is_live
+
+
+def test_draw_gives_both_teams_a_point() -> None:
+    """Both teams of a drawn match get a point and a game tied."""
+    live = build_live_table(make_table([9, 7, 6, 4]), [make_live_fixture(1, 3, (1, 1))])
+
+    by_team = {s.team_id: s for s in live}
+    assert (by_team[1].points, by_team[1].games_tied) == (10, 1)
+    assert (by_team[3].points, by_team[3].games_tied) == (7, 1)
+
+
+def test_tiebreak_by_goal_difference() -> None:
+    """Goal difference decides between teams level on points, before goals scored."""
+    table = make_table([9, 7, 6, 4])
+    table[2].goals_against = 5  # Team 3 has a goal difference of -2
+
+    live = build_live_table(table, [make_live_fixture(3, 4, (1, 1))])
+
+    # Team 3 scores more than team 2 but is behind on goal difference
+    assert [(s.team_id, s.points) for s in live] == [(1, 9), (2, 7), (3, 7), (4, 5)]
+
+
+def test_leaves_cached_table_alone() -> None:
+    """The cached table isn't changed by applying scores to it."""
+    table = make_table([9, 7, 6, 4])
+
+    build_live_table(table, [make_live_fixture(4, 1, (3, 0))])
+
+    assert [(s.team_id, s.rank, s.points) for s in table] == [
+        (1, 1, 9),
+        (2, 2, 7),
+        (3, 3, 6),
+        (4, 4, 4),
+    ]
+    assert not any(s.is_live for s in table)
+
+
+def test_skips_fixtures_that_do_not_apply() -> None:
+    """Matches yet to kick off or with a team outside the table change nothing."""
+    table = make_table([9, 7, 6])
+
+    live = build_live_table(
+        table, [make_live_fixture(1, 2, None, "NS"), make_live_fixture(3, 4, (5, 0))]
+    )
+
+    assert live is table
@@ -0,0 +1,145 @@
+"""Check the integration's setup and update paths never block the event loop."""
+
+from datetime import datetime
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.jakes_football import calendar, clock, sensor
+from custom_components.jakes_football.const import (
+    CUP_DATA,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    LEAGUE_DATA,
+    TEAM_DATA,
+)
+from custom_components.jakes_football.cup import CupAPI
+from custom_components.jakes_football.league import LeagueAPI
+from custom_components.jakes_football.scheduler import RequestScheduler, TokenBucket
+from custom_components.jakes_football.sports_api import SportsAPI
+from custom_components.jakes_football.team import TeamAPI
+from homeassistant.core import HomeAssistant
+
+from .loop_stall import LoopStallDetector
+from .replay import (
+    UPDATE_INTERVAL,
+    ReplayClock,
+    ReplayServer,
+    Timeline,
+)
+
+# Number of polls of every entity to run after setup
+CHECK_UPDATES = 3
+
+
+async def async_setup_apis(
+    hass: HomeAssistant, entry: MockConfigEntry, server: ReplayServer, team_id: int
+) -> list[SportsAPI]:
+    """Build the API objects as setup does, serving requests from the replay."""
+    team = TeamAPI("replay", team_id)
+    team.http_get = server.get
+    apis: list[SportsAPI] = [team]
+    leagues: dict[int, LeagueAPI] = {}
+    cups: dict[int, CupAPI] = {}
+    for comp in await hass.async_add_executor_job(team.get_current_competitions):
+        if comp.type == "League":
+            leagues[comp.id] = LeagueAPI("replay", comp.id)
+            apis.append(leagues[comp.id])
+        else:
+            cups[comp.id] = CupAPI("replay", comp)
+            apis.append(cups[comp.id])
+    league_comp = await hass.async_add_executor_job(team.get_league_competition)
+    if league_comp is not None:
+        team.league = leagues[league_comp.id]
+
+    for api in apis:
+        api.http_get = server.get
+    hass.data[DOMAIN] = {
+        entry.entry_id: {TEAM_DATA: team, LEAGUE_DATA: leagues, CUP_DATA: cups}
+    }
+    return apis
+
+
+async def async_run_check(
+    hass: HomeAssistant,
+    detector: LoopStallDetector,
+    timeline: Timeline,
+    start: datetime,
+    starved: bool = False,
+) -> list[str]:
+    """Set up both platforms and poll every entity, with the detector watching.
+
+    If starved, the rate limit is used up so every refresh during setup is deferred and
+    entities are created without the data they normally have. Returns the unique id of
+    every entity, prefixed with its platform since unique ids only need to be unique
+    within a platform.
+    """
+    entry = MockConfigEntry(domain=DOMAIN)
+    replay_clock = ReplayClock(start)
+    server = ReplayServer(timeline, replay_clock)
+    sensors: list[sensor.SensorEntity] = []
+    calendars: list[calendar.CalendarEntity] = []
+
+    previous_clock = clock.get_clock()
+    clock.set_clock(replay_clock)
+    try:
+        apis = await async_setup_apis(hass, entry, server, timeline.get_team_id())
+        if starved:
+            scheduler = RequestScheduler()
+            bucket = TokenBucket(DEFAULT_REQUESTS_PER_MINUTE)
+            bucket.tokens = 0
+            scheduler.buckets["replay"] = bucket
+            for api in apis:
+                api.scheduler = scheduler
+        for api in apis:
+            detector.guard_api(api)
+
+        await sensor.async_setup_entry(hass, entry, sensors.extend)
+        await calendar.async_setup_entry(hass, entry, calendars.extend)
+        for _ in range(CHECK_UPDATES):
+            for entity in sensors + calendars:
+                await entity.async_update()
+                _ = entity.extra_state_attributes
+            replay_clock.advance(UPDATE_INTERVAL)
+    finally:
+        clock.set_clock(previous_clock)
+
+    unique_ids = ["sensor." + str(entity.unique_id) for entity in sensors]
+    unique_ids.extend("calendar." + str(entity.unique_id) for entity in calendars)
+    return unique_ids
+
+
+async def test_setup_and_updates_do_not_block_the_loop(
+    hass: HomeAssistant,
+    kick_off_scenario: tuple[Timeline, datetime, datetime],
+    loop_stall_detector: LoopStallDetector,
+    simulation_executor: None,
+) -> None:
+    """Setup and polling make no blocking calls from the loop and never stall it."""
+    timeline, start, _ = kick_off_scenario
+
+    unique_ids = await async_run_check(hass, loop_stall_detector, timeline, start)
+
+    assert loop_stall_detector.problems == []
+    assert len(unique_ids) == len(set(unique_ids))
+
+
+async def test_setup_with_no_quota_keeps_unique_ids(
+    hass: HomeAssistant,
+    kick_off_scenario: tuple[Timeline, datetime, datetime],
+    loop_stall_detector: LoopStallDetector,
+    simulation_executor: None,
+) -> None:
+    """Entities get the same unique ids when every refresh during setup is deferred.
+
+    An entity whose unique id changes between setups is orphaned in the entity registry
+    and comes back as a new entity, losing its entity id, name and history.
+    """
+    timeline, start, _ = kick_off_scenario
+
+    expected = await async_run_check(hass, loop_stall_detector, timeline, start)
+    unique_ids = await async_run_check(
+        hass, loop_stall_detector, timeline, start, starved=True
+    )
+
+    assert loop_stall_detector.problems == []
+    assert sorted(unique_ids) == sorted(expected)
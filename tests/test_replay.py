@@ -0,0 +1,163 @@
+"""Replay the built in scenarios, checking what they cost and the state they leave."""
+
+import pytest
+
+from custom_components.jakes_football.team import TeamAPI
+
+from .replay import BUILTIN_PERIODS, ReplayReport, get_builtin_scenario, run_scenario
+
+
+@pytest.fixture(scope="module")
+def reports() -> dict[str, ReplayReport]:
+    """Replay every built in scenario once for the whole module."""
+    return {
+        name: run_scenario(name, *get_builtin_scenario(name))
+        for name in BUILTIN_PERIODS
+    }
+
+
+def get_team(report: ReplayReport) -> TeamAPI:
+    """Get the team a scenario was replayed for."""
+    assert report.team is not None
+    assert report.team.league is not None
+    return report.team
+
+
+def get_table(team: TeamAPI) -> list[tuple[int, int, int]]:
+    """Get the team id, points and games played of each row of the live table."""
+    assert team.league is not None
+    return [
+        (s.team_id, s.points, s.games_played)
+        for s in team.league.get_cached_live_table()
+    ]
+
+
+@pytest.mark.parametrize(
+    ("name", "refresh_cycles", "requests"),
+    [
+        (
+            "kick-off",
+            8,
+            {
+                "fixtures?live": 7,
+                "fixtures?id": 6,
+                "fixtures?season&team": 2,
+                "teams?id": 1,
+                "standings?league&season": 1,
+                "fixtures?league&season": 1,
+            },
+        ),
+        (
+            "half-time",
+            14,
+            {
+                "fixtures?live": 10,
+                "fixtures?id": 7,
+                "teams?id": 1,
+                "standings?league&season": 1,
+                "fixtures?league&season": 1,
+                "fixtures?season&team": 1,
+            },
+        ),
+        (
+            "full-time",
+            10,
+            {
+                "fixtures?id": 8,
+                "fixtures?live": 5,
+                "standings?league&season": 2,
+                "fixtures?league&season": 2,
+                "fixtures?season&team": 2,
+                "teams?id": 1,
+            },
+        ),
+        (
+            "day rollover",
+            4,
+            {
+                "standings?league&season": 2,
+                "fixtures?league&season": 2,
+                "fixtures?season&team": 2,
+                "teams?id": 1,
+            },
+        ),
+        (
+            "season rollover",
+            4,
+            {
+                "standings?league&season": 2,
+                "fixtures?league&season": 2,
+                "fixtures?season&team": 2,
+                "teams?id": 1,
+                "leagues?team": 1,
+            },
+        ),
+    ],
+)
+def test_request_cost(
+    reports: dict[str, ReplayReport],
+    name: str,
+    refresh_cycles: int,
+    requests: dict[str, int],
+) -> None:
+    """Each scenario makes the same requests, in the same number of refresh cycles."""
+    report = reports[name]
+
+    assert report.refresh_cycles == refresh_cycles
+    assert dict(report.requests) == requests
+
+
+def test_kick_off(reports: dict[str, ReplayReport]) -> None:
+    """The match is followed live once it kicks off and applied to the table."""
+    team = get_team(reports["kick-off"])
+
+    current = team.get_current_fixture()
+    assert current.is_valid
+    assert current.fixture.id == 20242
+    assert current.fixture.status.short == "1H"
+    assert list(team.league.live_fixtures) == [20242]
+    assert team.league.get_attributes()["is_live"]
+    assert get_table(team) == [(1, 4, 2), (2, 1, 2)]
+
+
+def test_half_time(reports: dict[str, ReplayReport]) -> None:
+    """The second half score is followed live and applied to the table."""
+    team = get_team(reports["half-time"])
+
+    current = team.get_current_fixture()
+    assert current.fixture.status.short == "2H"
+    assert current.goals is not None
+    assert (current.goals.home, current.goals.away) == (1, 0)
+    assert get_table(team) == [(1, 6, 2), (2, 0, 2)]
+
+
+def test_full_time(reports: dict[str, ReplayReport]) -> None:
+    """The final score stays in the table until the standings include it."""
+    team = get_team(reports["full-time"])
+
+    assert not team.get_current_fixture().is_valid
+    previous = team.get_previous_fixture()
+    assert previous.fixture.id == 20242
+    assert previous.fixture.status.short == "FT"
+    assert previous.goals is not None
+    assert (previous.goals.home, previous.goals.away) == (1, 1)
+    assert get_table(team) == [(1, 4, 2), (2, 1, 2)]
+
+
+def test_day_rollover(reports: dict[str, ReplayReport]) -> None:
+    """Overnight the table comes from the standings alone, which include the match."""
+    team = get_team(reports["day rollover"])
+
+    assert team.league.live_fixtures == {}
+    assert not team.league.get_attributes()["is_live"]
+    assert get_table(team) == [(1, 4, 2), (2, 1, 2)]
+    assert team.get_next_fixture().fixture.id == 20243
+
+
+def test_season_rollover(reports: dict[str, ReplayReport]) -> None:
+    """The new season's competitions and fixtures are picked up."""
+    team = get_team(reports["season rollover"])
+
+    assert not team.get_previous_fixture().is_valid
+    # The synthetic fixtures of a season are numbered from the season times ten
+    assert team.get_next_fixture().fixture.id == 20251
@@ -0,0 +1,82 @@
+"""Tests for sharing each key's rate limit between requests."""
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.jakes_football.const import DEFAULT_REQUESTS_PER_MINUTE
+from custom_components.jakes_football.exceptions import RequestDeferred
+from custom_components.jakes_football.scheduler import (
+    PRIORITY_RESERVE,
+    RequestPriority,
+    RequestScheduler,
+    TokenBucket,
+)
+
+from .replay import ReplayClock
+
+
+def test_bucket_fills_over_time(replay_clock: ReplayClock) -> None:
+    """Tokens come back at the per-minute rate, up to the limit."""
+    bucket = TokenBucket(10)
+    bucket.tokens = 0
+
+    replay_clock.advance(timedelta(seconds=30))
+    bucket.fill()
+    assert bucket.tokens == pytest.approx(5)
+
+    replay_clock.advance(timedelta(minutes=5))
+    bucket.fill()
+    assert bucket.tokens == 10
+
+
+def test_seconds_until_token(replay_clock: ReplayClock) -> None:
+    """The wait for a whole token depends on how much of one is left."""
+    bucket = TokenBucket(10)
+
+    assert bucket.get_seconds_until_token() == 0
+    bucket.tokens = 0.5
+    assert bucket.get_seconds_until_token() == pytest.approx(3)
+
+
+def test_low_priority_keeps_a_reserve(replay_clock: ReplayClock) -> None:
+    """Less important requests are deferred while they would eat into the reserve."""
+    scheduler = RequestScheduler()
+
+    sent = 0
+    with pytest.raises(RequestDeferred):
+        while True:
+            scheduler.acquire("key", RequestPriority.TEAM_INFO)
+            sent += 1
+
+    reserve = PRIORITY_RESERVE[RequestPriority.TEAM_INFO]
+    assert sent == DEFAULT_REQUESTS_PER_MINUTE - reserve
+    # The reserve is still there for more important requests
+    for _ in range(reserve):
+        scheduler.acquire("key", RequestPriority.LIVE)
+    with pytest.raises(RequestDeferred):
+        scheduler.acquire("key", RequestPriority.STANDINGS)
+
+
+def test_keys_have_their_own_buckets(replay_clock: ReplayClock) -> None:
+    """Running out on one key doesn't hold back requests with another."""
+    scheduler = RequestScheduler()
+    scheduler.buckets["empty"] = TokenBucket(DEFAULT_REQUESTS_PER_MINUTE)
+    scheduler.buckets["empty"].tokens = 0
+
+    with pytest.raises(RequestDeferred):
+        scheduler.acquire("empty", RequestPriority.FIXTURES)
+    scheduler.acquire("full", RequestPriority.FIXTURES)
+
+
+def test_update_limit(replay_clock: ReplayClock) -> None:
+    """The bucket follows the per-minute limit the API reports."""
+    scheduler = RequestScheduler()
+    scheduler.acquire("key", RequestPriority.LIVE)
+
+    scheduler.update_limit("key", {"x-ratelimit-limit": "300"})
+    assert scheduler.buckets["key"].requests_per_minute == 300
+
+    scheduler.update_limit("key", {})
+    scheduler.update_limit("key", {"x-ratelimit-limit": "0"})
+    assert scheduler.buckets["key"].requests_per_minute == 300
@@ -0,0 +1,111 @@
+"""Tests for the per-gameweek history of a league's standings."""
+
+import os
+
+from custom_components.jakes_football.league import LeagueStanding
+from custom_components.jakes_football.standings_history import StandingsHistory
+
+from .replay import make_standing, make_team
+
+TEAMS = [make_team(team_id, "Team " + str(team_id)) for team_id in range(1, 5)]
+
+
+def make_table(order: list[int]) -> list[LeagueStanding]:
+    """Build a table with the teams, numbered from 1, in this order."""
+    return [
+        LeagueStanding(make_standing(TEAMS[team_id - 1], rank, 0, 0))
+        for rank, team_id in enumerate(order, start=1)
+    ]
+
+
+def make_history() -> StandingsHistory:
+    """Build a history of three gameweeks."""
+    history = StandingsHistory(2024)
+    history.record(2024, 1, make_table([1, 2, 3]))
+    history.record(2024, 2, make_table([2, 1, 3]))
+    # A team is added part way through the season
+    history.record(2024, 3, make_table([4, 2, 1, 3]))
+    return history
+
+
+def test_position_history() -> None:
+    """A team's position is kept for each gameweek it was in the table."""
+    history = make_history()
+
+    assert list(history.get_recorded_gameweeks()) == [1, 2, 3]
+    assert history.get_position_history(1) == {1: 1, 2: 2, 3: 3}
+    assert history.get_position_history(4) == {3: 1}
+    assert history.get_position_history(99) == {}
+
+
+def test_new_season_clears_history() -> None:
+    """Recording a different season starts the history again."""
+    history = make_history()
+
+    history.record(2025, 1, make_table([3, 2, 1]))
+
+    assert history.season_number == 2025
+    assert history.get_position_history(1) == {1: 3}
+    assert history.get_position_history(4) == {}
+
+
+def test_out_of_range_gameweeks_are_ignored() -> None:
+    """Gameweeks the history has no row for aren't recorded."""
+    history = StandingsHistory(2024)
+
+    history.record(2024, -1, make_table([1, 2]))
+    history.record(2024, 1000, make_table([1, 2]))
+
+    assert len(history.get_recorded_gameweeks()) == 0
+
+
+def test_biggest_movers() -> None:
+    """The teams that climbed and fell furthest over the last gameweek are found."""
+    history = StandingsHistory(2024)
+    history.record(2024, 1, make_table([1, 2, 3, 4]))
+    assert history.get_biggest_movers() is None  # Only one gameweek
+
+    history.record(2024, 2, make_table([1, 2, 3, 4]))
+    assert history.get_biggest_movers() is None  # Nobody moved
+
+    history.record(2024, 3, make_table([4, 1, 2, 3]))
+    movers = history.get_biggest_movers()
+    assert movers is not None
+    riser, faller = movers
+    assert riser.get_attributes() == {
+        "team_id": 4,
+        "team_name": "Team 4",
+        "from": 4,
+        "to": 1,
+        "change": 3,
+    }
+    assert (faller.team_id, faller.rank_from, faller.rank_to) == (1, 1, 2)
+
+
+def test_save_and_load(tmp_path) -> None:
+    """A saved history loads back the same, leaving no temporary files behind."""
+    history = make_history()
+    path = StandingsHistory.get_path(str(tmp_path), "entry", 39)
+
+    history.save(path)
+    loaded = StandingsHistory.load(path)
+
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert loaded.season_number == 2024
+    assert loaded.team_names == history.team_names
+    assert loaded.get_position_history(1) == {1: 1, 2: 2, 3: 3}
+    assert loaded.get_position_history(4) == {3: 1}
+
+
+def test_remove_all(tmp_path) -> None:
+    """Only the histories of the entry being removed are deleted."""
+    history = make_history()
+    # Glob characters in an entry id don't match other entries' files
+    for entry_id, league_id in [("a*", 39), ("a*", 40), ("ab", 39)]:
+        history.save(StandingsHistory.get_path(str(tmp_path), entry_id, league_id))
+
+    StandingsHistory.remove_all(str(tmp_path), "a*")
+
+    assert os.listdir(tmp_path) == [
+        os.path.basename(StandingsHistory.get_path(str(tmp_path), "ab", 39))
+    ]
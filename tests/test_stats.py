@@ -0,0 +1,94 @@
+"""Tests for the form and performance stats of every team in a league."""
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.jakes_football.fixture import FixtureData
+from custom_components.jakes_football.stats import LeagueStats
+
+from .replay import KICK_OFF, make_fixture, make_team
+
+TEAMS = [make_team(team_id, "Team " + str(team_id)) for team_id in range(1, 4)]
+
+
+def make_result(
+    week: int, home: int, away: int, goals: tuple[int, int] | None, status: str = "FT"
+) -> FixtureData:
+    """Build a match between two of the teams, numbered from 1, played in a week."""
+    return FixtureData(
+        make_fixture(
+            week * 100 + home * 10 + away,
+            39,
+            2024,
+            TEAMS[home - 1],
+            TEAMS[away - 1],
+            KICK_OFF + timedelta(weeks=week),
+            status,
+            90 if status == "FT" else None,
+            goals,
+        )
+    )
+
+
+def make_stats(window: int = 2) -> LeagueStats:
+    """Compute stats for a few weeks of results."""
+    return LeagueStats(
+        [
+            make_result(1, 1, 2, (2, 0)),
+            make_result(2, 3, 1, (1, 1)),
+            make_result(3, 2, 1, (3, 1)),
+            make_result(4, 1, 3, (0, 0)),
+            make_result(5, 2, 3, None, "NS"),  # Not played yet
+        ],
+        window,
+    )
+
+
+def test_home_and_away_split() -> None:
+    """Home and away results are counted separately."""
+    team = make_stats().get_team_stats(1)
+    assert team is not None
+
+    assert team.home.get_attributes() == {
+        "played": 2,
+        "won": 1,
+        "tied": 1,
+        "lost": 0,
+        "points": 4,
+        "points_per_game": 2.0,
+        "goals_for": 2,
+        "goals_against": 0,
+    }
+    assert (team.away.played, team.away.tied, team.away.lost) == (2, 1, 1)
+    assert (team.away.goals_for, team.away.goals_against) == (2, 4)
+
+
+def test_form_and_recent_results() -> None:
+    """Form and recent results cover the last matches in the window, oldest first."""
+    stats = make_stats()
+    team = stats.get_team_stats(1)
+    assert team is not None
+
+    assert team.form == "LD"
+    assert (team.recent.played, team.recent.points) == (2, 1)
+    assert stats.get_team_stats(2).form == "LW"
+    assert stats.get_team_stats(3).form == "DD"
+
+
+def test_goal_trends() -> None:
+    """Trends compare recent goals per game with the season's."""
+    team = make_stats().get_team_stats(1)
+    assert team is not None
+
+    # 1 scored and 3 conceded in the last two, against 4 and 4 in all four
+    assert team.goals_for_trend == pytest.approx(0.5 - 1.0)
+    assert team.goals_against_trend == pytest.approx(1.5 - 1.0)
+
+
+def test_unplayed_fixtures_are_ignored() -> None:
+    """Teams with no finished matches have no stats."""
+    stats = LeagueStats([make_result(1, 1, 2, None, "NS")])
+
+    assert stats.teams == {}
+    assert stats.get_team_stats(1) is None